@@ -161,8 +161,8 @@ async def run_agent_async(console_mode: bool = False):
         )
     
     # Connect agent callbacks to UI
-    agent.on_status_change(lambda s: ui.update_status(s.value))
-    agent.on_stats_update(lambda s: ui.update_stats(s))
+    agent.on_status_change(lambda s: ui.update(status=s.value))
+    agent.on_stats_update(lambda s: ui.update(stats=s))
     
     # Handle signals
     def signal_handler(sig, frame):
@@ -195,8 +195,19 @@ async def run_agent_async(console_mode: bool = False):
     ui.stop()
 
 
+def install_event_loop_policy():
+    """Use uvloop for the event loop when it is installed (not on Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.debug("Using uvloop event loop")
+
+
 def run_agent(console_mode: bool = False):
     """Run the agent (sync wrapper)."""
+    install_event_loop_policy()
     try:
         asyncio.run(run_agent_async(console_mode))
     except KeyboardInterrupt:
@@ -5,10 +5,13 @@ Uses python-socketio to connect to NestJS Socket.io server.
 
 import asyncio
 import json
-from typing import Optional, Dict, Any, Callable, Awaitable
+from itertools import islice
+from typing import Optional, Dict, Any, Callable, Awaitable, Iterable
 from datetime import datetime
 from loguru import logger
 
+from src.utils.helpers import iso_from_ns
+
 try:
     import socketio
     SOCKETIO_AVAILABLE = True
@@ -36,6 +39,9 @@ class PlatformWebSocket:
     
     RECONNECT_DELAY = 5  # Seconds between reconnection attempts
     HEARTBEAT_INTERVAL = 30  # Seconds between heartbeats
+    SCRAPE_RESULTS_CHUNK_SIZE = 256  # Links per scrape:results event
+    RESULT_QUEUE_SIZE = 256  # Max task results waiting to be sent
+    RESULT_FLUSH_TIMEOUT = 5  # Seconds to wait for queued results on disconnect
     
     def __init__(
         self,
@@ -78,6 +84,13 @@ class PlatformWebSocket:
         
         # Heartbeat task
         self._heartbeat_task: Optional[asyncio.Task] = None
+        
+        # Long-running callbacks spawned from event handlers
+        self._handler_tasks: set = set()
+        
+        # Outbound task results (bounded for back-pressure)
+        self._result_queue: asyncio.Queue = asyncio.Queue(maxsize=self.RESULT_QUEUE_SIZE)
+        self._result_task: Optional[asyncio.Task] = None
     
     @property
     def is_connected(self) -> bool:
@@ -125,8 +138,9 @@ class PlatformWebSocket:
                 self._connected = True
                 logger.success("✅ Socket.io connected to platform")
                 
-                # Start heartbeat
+                # Start heartbeat and result sender
                 self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+                self._result_task = asyncio.create_task(self._result_flush_loop())
                 
                 return True
             else:
@@ -160,7 +174,8 @@ class PlatformWebSocket:
         async def on_task_execute(data):
             logger.info(f"Socket.io: Received task to execute")
             if self.on_task:
-                await self.on_task(data)
+                # Tasks run for minutes; don't hold up the event handler
+                self._spawn(self.on_task(data))
         
         @sio.on('config:update', namespace='/ws/agent')
         async def on_config_update(data):
@@ -185,8 +200,35 @@ class PlatformWebSocket:
         async def on_connect_error(data):
             logger.error(f"Socket.io: Connection error: {data}")
     
+    def _spawn(self, coro: Awaitable[None]):
+        """Run a callback in the background, keeping a reference until done."""
+        task = asyncio.create_task(coro)
+        self._handler_tasks.add(task)
+        task.add_done_callback(self._handler_tasks.discard)
+    
     async def disconnect(self):
         """Disconnect from platform."""
+        # Cancel callbacks still running or queued (e.g. tasks waiting their
+        # turn) first, so results they queue while winding down get sent
+        pending = [t for t in self._handler_tasks if t is not asyncio.current_task()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        # Let the result sender drain before marking the link closed
+        if self._result_task:
+            try:
+                await asyncio.wait_for(self._result_queue.join(), timeout=self.RESULT_FLUSH_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("Timed out sending queued task results")
+            self._result_task.cancel()
+            try:
+                await self._result_task
+            except asyncio.CancelledError:
+                pass
+            self._result_task = None
+        
         self._should_run = False
         self._connected = False
         
@@ -221,6 +263,36 @@ class PlatformWebSocket:
             except Exception as e:
                 logger.error(f"Heartbeat error: {e}")
     
+    async def queue_task_result(self, task_id: str, result: Dict[str, Any], success: bool = True, error: str = None):
+        """
+        Queue a task result for the background sender.
+        
+        Waits only if RESULT_QUEUE_SIZE results are already pending.
+        
+        Args:
+            task_id: ID of the completed task
+            result: Task result dictionary
+            success: Whether task completed successfully
+            error: Error message if task failed
+        """
+        await self._result_queue.put((task_id, result, success, error))
+    
+    async def _result_flush_loop(self):
+        """Background task that sends queued task results in order."""
+        while True:
+            try:
+                item = await self._result_queue.get()
+            except asyncio.CancelledError:
+                break
+            try:
+                await self.send_task_result(*item)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Result sender error: {e}")
+            finally:
+                self._result_queue.task_done()
+    
     async def send_task_result(self, task_id: str, result: Dict[str, Any], success: bool = True, error: str = None):
         """
         Send task execution result to platform.
@@ -235,6 +307,11 @@ class PlatformWebSocket:
             logger.warning("Not connected, cannot send task result")
             return
         
+        # Results carry a numeric timestamp; format it only at the wire
+        if "timestamp_ns" in result:
+            result = dict(result)
+            result["timestamp"] = iso_from_ns(result.pop("timestamp_ns"))
+        
         try:
             await self._sio.emit('task:complete', {
                 'taskId': task_id,
@@ -292,7 +369,14 @@ class PlatformWebSocket:
         except Exception as e:
             logger.debug(f"Failed to send log: {e}")
     
-    async def send_task_started(self, task_id: str, task_type: str, url: str = None, keywords: list = None):
+    async def send_task_started(
+        self,
+        task_id: str,
+        task_type: str,
+        url: str = None,
+        keywords: list = None,
+        initial_log: str = None
+    ):
         """
         Notify platform that a task has started.
         
@@ -301,6 +385,7 @@ class PlatformWebSocket:
             task_type: Type of task (scrape, signup)
             url: Target URL (for signup tasks)
             keywords: Search keywords (for scrape tasks)
+            initial_log: Optional info log queued right behind task:started
         """
         if not self._connected or not self._sio:
             return
@@ -312,43 +397,65 @@ class PlatformWebSocket:
                 'url': url,
                 'keywords': keywords
             }, namespace='/ws/agent')
+            # Queue the log with no round-trip in between so Engine.IO can
+            # flush both packets together
+            if initial_log:
+                await self._sio.emit('log', {
+                    'level': 'info',
+                    'message': initial_log,
+                    'taskId': task_id,
+                    'metadata': None
+                }, namespace='/ws/agent')
             logger.debug(f"Sent task:started for {task_id}")
         except Exception as e:
             logger.error(f"Failed to send task:started: {e}")
     
-    async def send_scraped_links(self, links: list, task_id: str = None):
+    async def send_scraped_links(self, links: Iterable[Dict[str, Any]], task_id: str = None) -> int:
         """
         Send scraped links to platform for bulk storage.
         
+        Links are streamed from the iterable and sent in chunks of
+        SCRAPE_RESULTS_CHUNK_SIZE per event.
+        
         Args:
-            links: List of scraped link data dictionaries
+            links: Iterable of scraped link data dictionaries
             task_id: Optional task ID
+            
+        Returns:
+            Number of links sent
         """
         if not self._connected or not self._sio:
             logger.warning("Not connected, cannot send scraped links")
-            return
+            return 0
         
+        sent = 0
+        links = iter(links)
         try:
-            await self._sio.emit('scrape:results', {
-                'links': links,
-                'count': len(links),
-                'taskId': task_id
-            }, namespace='/ws/agent')
-            logger.info(f"Sent {len(links)} scraped links to platform")
+            while True:
+                chunk = list(islice(links, self.SCRAPE_RESULTS_CHUNK_SIZE))
+                if not chunk:
+                    break
+                await self._sio.emit('scrape:results', {
+                    'links': chunk,
+                    'count': len(chunk),
+                    'taskId': task_id
+                }, namespace='/ws/agent')
+                sent += len(chunk)
+            logger.info(f"Sent {sent} scraped links to platform")
         except Exception as e:
             logger.error(f"Failed to send scraped links: {e}")
+        return sent
     
     async def process_messages(self):
         """
         Process incoming messages.
-        Socket.io handles this automatically, but we need this for compatibility.
+        Socket.io dispatches events from its own reader task, so this
+        suspends until the connection ends instead of polling.
         """
-        if not self._connected:
+        if not self._connected or not self._sio:
             return
         
-        # Socket.io handles message processing internally
-        # Just yield control to event loop
-        await asyncio.sleep(0.1)
+        await self._sio.wait()
 
 
 class MockPlatformWebSocket:
@@ -359,6 +466,7 @@ class MockPlatformWebSocket:
     
     def __init__(self, **kwargs):
         self.is_connected = False
+        self._disconnected = asyncio.Event()
         self.on_task = kwargs.get("on_task")
         self.on_config_update = kwargs.get("on_config_update")
         self.on_command = kwargs.get("on_command")
@@ -370,19 +478,25 @@ class MockPlatformWebSocket:
     
     async def disconnect(self):
         self.is_connected = False
+        self._disconnected.set()
         logger.info("Mock Socket.io: Disconnected")
     
-    async def send_task_result(self, task_id: str, result: Dict[str, Any]):
+    async def send_task_result(self, task_id: str, result: Dict[str, Any], success: bool = True, error: str = None):
         logger.info(f"Mock Socket.io: Task result for {task_id}: {result.get('success')}")
     
+    async def queue_task_result(self, task_id: str, result: Dict[str, Any], success: bool = True, error: str = None):
+        await self.send_task_result(task_id, result, success, error)
+    
     async def send_task_progress(self, task_id: str, progress: int, status: str = None):
         logger.debug(f"Mock Socket.io: Progress {progress}%")
     
     async def send_log(self, level: str, message: str, metadata: Dict = None):
         pass
     
-    async def send_scraped_links(self, links: list):
-        logger.info(f"Mock Socket.io: Scraped {len(links)} links")
+    async def send_scraped_links(self, links: Iterable[Dict[str, Any]], task_id: str = None) -> int:
+        count = sum(1 for _ in links)
+        logger.info(f"Mock Socket.io: Scraped {count} links")
+        return count
     
     async def process_messages(self):
-        await asyncio.sleep(0.1)
+        await self._disconnected.wait()
@@ -15,6 +15,7 @@ from loguru import logger
 
 from playwright.async_api import Page
 from src.automation.llm_analyzer import LLMPageAnalyzer
+from src.utils.helpers import wait_or_stop
 
 
 class AgentAction:
@@ -91,7 +92,7 @@ class AIAgentOrchestrator:
     
     def __init__(self, page: Page, credentials: Dict[str, str], 
                  llm_provider: str = "openai", llm_config: Dict[str, Any] = None,
-                 stop_check: callable = None):
+                 stop_check: callable = None, stop_event: Optional[asyncio.Event] = None):
         """
         Initialize AI Agent.
         
@@ -101,12 +102,17 @@ class AIAgentOrchestrator:
             llm_provider: LLM provider ('openai' or 'anthropic')
             llm_config: LLM configuration (API key, model)
             stop_check: Optional callable that returns True if stop requested
+            stop_event: Optional event set when stop is requested; lets
+                waits end as soon as a stop arrives
         """
         self.page = page
         self.credentials = credentials
         self.llm_provider = llm_provider
         self.llm_config = llm_config or {}
         self.state = AgentState()
+        self._stop_event = stop_event
+        if stop_check is None and stop_event is not None:
+            stop_check = stop_event.is_set
         self._stop_check = stop_check or (lambda: False)
         
         # Vision optimization tracking
@@ -228,7 +234,7 @@ class AIAgentOrchestrator:
                 return {"success": False, "fields_filled": [], "actions": [], "errors": ["Stop requested"]}
             
             # Initial page load wait
-            await asyncio.sleep(2)
+            await wait_or_stop(2, self._stop_event)
             
             # Main reasoning loop
             # Track last action success for vision optimization
@@ -437,7 +443,8 @@ class AIAgentOrchestrator:
                 logger.error(f"❌ Agent execution failed: OpenAI API rate limit exceeded after progressive backoff")
                 logger.error(f"   💡 Suggestion: Wait a few minutes and try again, or upgrade your OpenAI API plan")
             else:
-                logger.error(f"❌ Agent execution failed: {e}", exc_info=True)
+                logger.error(f"❌ Agent execution failed: {e}")
+                logger.opt(exception=e).debug("Agent execution traceback")
             
             return {
                 "success": False,
@@ -640,8 +647,9 @@ class AIAgentOrchestrator:
                         logger.warning(f"⏳ Rate limit hit (retry {retry_attempt}/{max_rate_limit_retries}) - waiting {wait_time:.1f}s...")
                         
                         # Wait before retry
-                        import asyncio
-                        await asyncio.sleep(wait_time)
+                        if await wait_or_stop(wait_time, self._stop_event):
+                            logger.info("⏹ Stop requested - skipping LLM retry")
+                            return None
                         
                         logger.info(f"🔄 Retrying LLM call (attempt {retry_attempt + 1})...")
                         continue  # Retry the loop
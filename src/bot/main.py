@@ -107,7 +107,6 @@ async def main():
         if args.debug:
             config.app.debug = True
             config.app.log_level = "DEBUG"
-            logger.remove()
             setup_logger()
             logger.debug("Debug mode enabled")
     
@@ -155,11 +155,9 @@ class ReverseOutreachBot:
         if (source is None or source == "meta") and self.config.sources.meta_ads_library.enabled:
             logger.info("📡 Scraping Meta Ads Library...")
             try:
-                scraper = MetaAdsLibraryScraper(self.config)
-                await scraper.initialize()
-                meta_ads = await scraper.scrape_ads()
+                async with MetaAdsLibraryScraper(self.config) as scraper:
+                    meta_ads = await scraper.scrape_ads()
                 all_ads.extend(meta_ads)
-                await scraper.close()
                 logger.success(f"✅ Found {len(meta_ads)} ads from Meta Ads Library")
             except Exception as e:
                 logger.error(f"❌ Error scraping Meta Ads Library: {e}")
@@ -358,7 +356,8 @@ class ReverseOutreachBot:
             return True
                 
         except Exception as e:
-            logger.error(f"Error processing ad: {e}", exc_info=True)
+            logger.error(f"Error processing ad: {e}")
+            logger.opt(exception=e).debug("Ad processing traceback")
             await self._record_error(ad_url, ad_source, "processing_error", str(e))
             
             # Take error screenshot
@@ -41,6 +41,8 @@ class MetaAdsConfig(BaseModel):
     access_token: str = ""
     search_keywords: List[str] = Field(default_factory=list)
     ad_limit: int = 100
+    max_concurrency: int = 3  # Keywords scraped in parallel (one tab each)
+    cache_ttl_seconds: int = 0  # Reuse a keyword's results for this long (0 = off)
 
 
 class ExtensionDataConfig(BaseModel):
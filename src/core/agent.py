@@ -5,12 +5,14 @@ Coordinates browser automation, platform communication, and task execution.
 
 import asyncio
 import time
-from typing import Optional, Dict, Any, List, Callable
-from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Callable, Tuple, Awaitable, Iterator
 from enum import Enum
 from loguru import logger
 
 from .config import AgentConfig, get_agent_config
+from src.utils.helpers import iso_from_ns
 
 
 class AgentStatus(str, Enum):
@@ -25,6 +27,85 @@ class AgentStatus(str, Enum):
     OFFLINE = "offline"
 
 
+@lru_cache(maxsize=None)
+def _browser_automation_cls():
+    """Import BrowserAutomation once (pulls in Playwright)."""
+    from src.automation.browser import BrowserAutomation
+    return BrowserAutomation
+
+
+@lru_cache(maxsize=None)
+def _orchestrator_cls():
+    """Import AIAgentOrchestrator once (pulls in the LLM clients)."""
+    from src.automation.agent_orchestrator import AIAgentOrchestrator
+    return AIAgentOrchestrator
+
+
+@lru_cache(maxsize=None)
+def _meta_ads_scraper_cls():
+    """Import MetaAdsLibraryScraper once."""
+    from src.scrapers.meta_ads import MetaAdsLibraryScraper
+    return MetaAdsLibraryScraper
+
+
+@lru_cache(maxsize=None)
+def _csv_parser_cls():
+    """Import CSVDataParser once."""
+    from src.scrapers.csv_parser import CSVDataParser
+    return CSVDataParser
+
+
+def _iter_scraped_links(ads: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Yield platform link payloads for scraped ads that have a URL."""
+    for ad in ads:
+        url = ad.get("url")
+        if not url:
+            continue
+        yield {
+            "url": url,
+            "title": ad.get("title"),
+            "advertiserName": ad.get("advertiser_name"),
+            "source": "meta_ads",
+            "searchKeyword": ad.get("keyword"),
+            "metadata": {
+                "scraped_at": ad.get("scraped_at"),
+                "description": ad.get("description")
+            }
+        }
+
+
+class AgentStats:
+    """Task counters for the current agent session."""
+    
+    __slots__ = ("total_tasks", "successful", "failed", "current_session_start")
+    
+    def __init__(self):
+        self.total_tasks = 0
+        self.successful = 0
+        self.failed = 0
+        self.current_session_start: Optional[int] = None  # time.time_ns()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain dict copy for UI callbacks and status reports (session start as ISO-8601)."""
+        started = self.current_session_start
+        return {
+            "total_tasks": self.total_tasks,
+            "successful": self.successful,
+            "failed": self.failed,
+            "current_session_start": iso_from_ns(started) if started is not None else None
+        }
+
+
+_RUNNING_STATES = frozenset({AgentStatus.CONNECTED, AgentStatus.RUNNING})
+
+# Base result for tasks stopped by the user (copy before adding fields)
+_STOPPED_RESULT = MappingProxyType({"success": False, "error": "Stopped by user", "stopped": True})
+
+
+class _TaskStopped(Exception):
+    """Raised inside task execution when the user stops the current task."""
+
+
 class InboxHunterAgent:
     """
     Main agent class that:
@@ -34,51 +115,95 @@ class InboxHunterAgent:
     - Manages browser automation
     """
     
+    TASK_STOP_TIMEOUT = 30  # Seconds a stopping task gets to finish and report
+    
     def __init__(self, config: Optional[AgentConfig] = None):
         """Initialize the agent."""
         self.config = config or get_agent_config()
         self.status = AgentStatus.IDLE
+        self._status_str = self.status.value
         self._stop_agent = False  # Stop the entire agent
-        self._stop_task = False   # Stop the current task only
-        self._current_task: Optional[Dict[str, Any]] = None
+        self._stop_task_event = asyncio.Event()  # Stop the current task only
+        self._stop_event = asyncio.Event()  # Wakes the main loop on stop
+        self._task_done_event = asyncio.Event()  # Set while no task is running
+        self._task_done_event.set()
+        self._task_lock = asyncio.Lock()  # Serializes incoming tasks
         self._current_task_id: Optional[str] = None
+        self._current_task_type: Optional[str] = None
         
         # Components (lazy initialized)
         self._ws_client = None
         self._browser = None
         self._orchestrator = None
         
+        # Fallback signup credentials (built lazily, reset on config update)
+        self._default_credentials: Optional[Dict[str, Any]] = None
+        
+        # Legacy Config for automation code (built lazily, reset on config update)
+        self._legacy_config = None
+        
+        # Fire-and-forget sends (kept referenced until done)
+        self._background_tasks: set = set()
+        
         # Stats
-        self.stats = {
-            "total_tasks": 0,
-            "successful": 0,
-            "failed": 0,
-            "current_session_start": None
+        self.stats = AgentStats()
+        
+        # Platform command dispatch table
+        self._command_handlers: Dict[str, Callable[[Optional[str]], Awaitable[None]]] = {
+            "pause": self._cmd_pause,
+            "resume": self._cmd_resume,
+            "stop": self._cmd_stop,
+            "stop_task": self._cmd_stop,
+            "cancel_task": self._cmd_cancel,
+            "restart": self._cmd_restart,
         }
         
-        # Callbacks for UI updates
-        self._status_callbacks: List[Callable[[AgentStatus], None]] = []
-        self._log_callbacks: List[Callable[[str], None]] = []
-        self._stats_callbacks: List[Callable[[Dict], None]] = []
+        # Callbacks for UI updates. Stored as tuples rebuilt on registration,
+        # so a callback registering another mid-emit never mutates the tuple
+        # being iterated; the new listener is picked up on the next emit.
+        self._status_callbacks: Tuple[Callable[[AgentStatus], None], ...] = ()
+        self._log_callbacks: Tuple[Callable[[str], None], ...] = ()
+        self._stats_callbacks: Tuple[Callable[[Dict], None], ...] = ()
         
         logger.info("InboxHunter Agent initialized")
     
     def on_status_change(self, callback: Callable[[AgentStatus], None]):
         """Register callback for status changes."""
-        self._status_callbacks.append(callback)
+        self._status_callbacks += (callback,)
     
     def on_log(self, callback: Callable[[str], None]):
         """Register callback for log messages."""
-        self._log_callbacks.append(callback)
+        self._log_callbacks += (callback,)
     
     def on_stats_update(self, callback: Callable[[Dict], None]):
-        """Register callback for stats updates."""
-        self._stats_callbacks.append(callback)
+        """
+        Register callback for stats updates.
+        
+        All listeners receive the same stats snapshot and must treat it
+        as read-only.
+        """
+        self._stats_callbacks += (callback,)
+    
+    def off_status_change(self, callback: Callable[[AgentStatus], None]):
+        """Unregister a status change callback."""
+        self._status_callbacks = tuple(cb for cb in self._status_callbacks if cb != callback)
+    
+    def off_log(self, callback: Callable[[str], None]):
+        """Unregister a log message callback."""
+        self._log_callbacks = tuple(cb for cb in self._log_callbacks if cb != callback)
+    
+    def off_stats_update(self, callback: Callable[[Dict], None]):
+        """Unregister a stats update callback."""
+        self._stats_callbacks = tuple(cb for cb in self._stats_callbacks if cb != callback)
     
     def _set_status(self, status: AgentStatus):
         """Update status and notify callbacks."""
         self.status = status
-        for callback in self._status_callbacks:
+        self._status_str = status.value
+        callbacks = self._status_callbacks
+        if not callbacks:
+            return
+        for callback in callbacks:
             try:
                 callback(status)
             except Exception as e:
@@ -87,7 +212,10 @@ class InboxHunterAgent:
     def _emit_log(self, message: str):
         """Emit log message to callbacks."""
         logger.info(message)
-        for callback in self._log_callbacks:
+        callbacks = self._log_callbacks
+        if not callbacks:
+            return
+        for callback in callbacks:
             try:
                 callback(message)
             except Exception as e:
@@ -95,9 +223,13 @@ class InboxHunterAgent:
     
     def _emit_stats(self):
         """Emit stats update to callbacks."""
-        for callback in self._stats_callbacks:
+        callbacks = self._stats_callbacks
+        if not callbacks:
+            return
+        snapshot = self.stats.snapshot()
+        for callback in callbacks:
             try:
-                callback(self.stats.copy())
+                callback(snapshot)
             except Exception as e:
                 logger.error(f"Stats callback error: {e}")
     
@@ -118,7 +250,7 @@ class InboxHunterAgent:
                 url=self.config.platform.ws_url,
                 agent_id=self.config.agent_id,
                 agent_token=self.config.agent_token,
-                on_task=self._handle_task,
+                on_task=self._run_task_serialized,
                 on_config_update=self._handle_config_update,
                 on_command=self._handle_command
             )
@@ -148,6 +280,14 @@ class InboxHunterAgent:
         self._set_status(AgentStatus.OFFLINE)
         self._emit_log("Disconnected from platform")
     
+    async def _run_task_serialized(self, task: Dict[str, Any]):
+        """Run tasks one at a time; they share the browser and stop flag."""
+        async with self._task_lock:
+            if self._stop_agent:
+                logger.info(f"Agent stopping - skipping queued task {task.get('task_id')}")
+                return
+            await self._handle_task(task)
+    
     async def _handle_task(self, task: Dict[str, Any]):
         """
         Handle incoming task from platform.
@@ -161,12 +301,13 @@ class InboxHunterAgent:
         keywords = task.get("params", {}).get("keywords", [])
         
         self._emit_log(f"📥 Received task: {task_type} (ID: {task_id})")
-        self._current_task = task
         self._current_task_id = task_id
-        self.stats["total_tasks"] += 1
+        self._current_task_type = task_type
+        self._task_done_event.clear()
+        self.stats.total_tasks += 1
         
         # Reset task stop flag for new task
-        self._stop_task = False
+        self._stop_task_event.clear()
         
         try:
             self._set_status(AgentStatus.RUNNING)
@@ -177,9 +318,9 @@ class InboxHunterAgent:
                     task_id=task_id,
                     task_type=task_type,
                     url=url,
-                    keywords=keywords if task_type == "scrape" else None
+                    keywords=keywords if task_type == "scrape" else None,
+                    initial_log=f"Starting {task_type} task..."
                 )
-                await self._send_log("info", f"Starting {task_type} task...", task_id)
             
             if task_type == "signup":
                 result = await self._execute_signup_task(task)
@@ -192,7 +333,7 @@ class InboxHunterAgent:
             if self._ws_client:
                 success = result.get("success", False)
                 error = result.get("error")
-                await self._ws_client.send_task_result(
+                await self._ws_client.queue_task_result(
                     task_id=task_id,
                     result=result,
                     success=success,
@@ -200,11 +341,11 @@ class InboxHunterAgent:
                 )
             
             if result.get("success"):
-                self.stats["successful"] += 1
+                self.stats.successful += 1
                 self._emit_log(f"✅ Task completed successfully")
                 await self._send_log("success", "Task completed successfully", task_id)
             else:
-                self.stats["failed"] += 1
+                self.stats.failed += 1
                 error_msg = result.get('error', 'Unknown error')
                 self._emit_log(f"❌ Task failed: {error_msg}")
                 await self._send_log("error", f"Task failed: {error_msg}", task_id)
@@ -212,13 +353,13 @@ class InboxHunterAgent:
             self._emit_stats()
             
         except Exception as e:
-            logger.error(f"Task execution error: {e}", exc_info=True)
-            self.stats["failed"] += 1
+            self._log_exception("Task execution error", e)
+            self.stats.failed += 1
             self._emit_log(f"❌ Task error: {e}")
             await self._send_log("error", f"Task error: {str(e)}", task_id)
             
             if self._ws_client:
-                await self._ws_client.send_task_result(
+                await self._ws_client.queue_task_result(
                     task_id=task_id,
                     result={"success": False, "error": str(e)},
                     success=False,
@@ -226,19 +367,34 @@ class InboxHunterAgent:
                 )
         
         finally:
-            self._current_task = None
             self._current_task_id = None
-            self._stop_task = False  # Reset task stop flag
+            self._current_task_type = None
+            self._stop_task_event.clear()  # Reset task stop flag
+            self._task_done_event.set()
             if not self._stop_agent:
                 self._set_status(AgentStatus.CONNECTED)
     
+    @staticmethod
+    def _log_exception(prefix: str, exc: BaseException):
+        """Log an error one-line; the traceback only goes to DEBUG sinks."""
+        logger.error(f"{prefix}: {exc}")
+        logger.opt(exception=exc).debug(prefix)
+    
     async def _send_log(self, level: str, message: str, task_id: str = None):
         """Send log to platform via WebSocket."""
         if self._ws_client:
             try:
                 await self._ws_client.send_log(level, message, task_id=task_id)
             except Exception as e:
-                logger.debug(f"Failed to send log to platform: {e}")
+                logger.debug("Failed to send log to platform: {}", e)
+    
+    def _fire_log(self, level: str, message: str, task_id: str = None):
+        """Send a progress log to the platform without blocking the task."""
+        if not self._ws_client:
+            return
+        task = asyncio.create_task(self._send_log(level, message, task_id))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
     
     async def _execute_signup_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -250,51 +406,34 @@ class InboxHunterAgent:
         Returns:
             Result dictionary
         """
-        from src.automation.browser import BrowserAutomation
-        from src.automation.agent_orchestrator import AIAgentOrchestrator
+        BrowserAutomation = _browser_automation_cls()
+        AIAgentOrchestrator = _orchestrator_cls()
         
         task_id = task.get("task_id")
         url = task.get("url")
-        credentials = task.get("credentials", {})
         
         # Use task credentials or fall back to config
-        if not credentials:
-            credentials = {
-                "email": self.config.credentials.email,
-                "first_name": self.config.credentials.first_name,
-                "last_name": self.config.credentials.last_name,
-                "full_name": self.config.credentials.full_name,
-                "phone": {
-                    "country_code": self.config.credentials.phone_country_code,
-                    "number": self.config.credentials.phone_number,
-                    "full": self.config.credentials.phone_full
-                }
-            }
+        credentials = task.get("credentials") or self._get_default_credentials()
         
         self._emit_log(f"🌐 Processing: {url}")
-        await self._send_log("info", f"Processing URL: {url}", task_id)
-        
-        # Check stop before starting
-        if self._stop_task:
-            await self._send_log("warning", "Task stopped before starting", task_id)
-            return {"success": False, "error": "Stopped by user", "url": url, "stopped": True}
-        
-        await self._send_log("info", "Initializing browser...", task_id)
-        
-        # Initialize browser if needed
-        if self._browser is None:
-            self._browser = BrowserAutomation(self._build_legacy_config())
-            await self._browser.initialize()
+        self._fire_log("info", f"Processing URL: {url}", task_id)
         
         try:
+            # Check stop before starting
+            await self._check_stop(task_id, "Task stopped before starting")
+            
+            self._fire_log("info", "Initializing browser...", task_id)
+            
+            # Initialize browser if needed
+            if self._browser is None:
+                self._browser = BrowserAutomation(self._build_legacy_config())
+                await self._browser.initialize()
+            
             # Check stop after browser init
-            if self._stop_task:
-                await self._send_log("warning", "Task stopped by user", task_id)
-                await self._close_browser()
-                return {"success": False, "error": "Stopped by user", "url": url, "stopped": True}
+            await self._check_stop(task_id)
             
             # Navigate to page
-            await self._send_log("info", "Loading page...", task_id)
+            self._fire_log("info", "Loading page...", task_id)
             
             success = await self._browser.navigate(url)
             if not success:
@@ -302,25 +441,19 @@ class InboxHunterAgent:
                 return {"success": False, "error": "Failed to load page"}
             
             # Check stop after navigation
-            if self._stop_task:
-                await self._send_log("warning", "Task stopped by user", task_id)
-                await self._close_browser()
-                return {"success": False, "error": "Stopped by user", "url": url, "stopped": True}
+            await self._check_stop(task_id)
             
-            await self._send_log("info", "Detecting page structure...", task_id)
+            self._fire_log("info", "Detecting page structure...", task_id)
             
             # Detect platform
             platform = await self._browser.detect_platform()
             self._emit_log(f"🔍 Platform detected: {platform}")
-            await self._send_log("info", f"Platform detected: {platform}", task_id)
+            self._fire_log("info", f"Platform detected: {platform}", task_id)
             
             # Check stop after platform detection
-            if self._stop_task:
-                await self._send_log("warning", "Task stopped by user", task_id)
-                await self._close_browser()
-                return {"success": False, "error": "Stopped by user", "url": url, "stopped": True}
+            await self._check_stop(task_id)
             
-            await self._send_log("info", "Analyzing form fields...", task_id)
+            self._fire_log("info", "Analyzing form fields...", task_id)
             
             # Create AI agent
             agent = AIAgentOrchestrator(
@@ -331,35 +464,32 @@ class InboxHunterAgent:
                     "api_key": self.config.llm.api_key,
                     "model": self.config.llm.model
                 },
-                stop_check=lambda: self._stop_task
+                stop_event=self._stop_task_event
             )
             
             # Check stop before AI analysis
-            if self._stop_task:
-                await self._send_log("warning", "Task stopped by user", task_id)
-                await self._close_browser()
-                return {"success": False, "error": "Stopped by user", "url": url, "stopped": True}
+            await self._check_stop(task_id)
             
-            await self._send_log("info", "AI analyzing form...", task_id)
+            self._fire_log("info", "AI analyzing form...", task_id)
             
             # Execute signup
             result = await agent.execute_signup()
             
             # Check if stopped during execution
-            if self._stop_task:
+            if self._stop_task_event.is_set():
                 await self._send_log("warning", "Task stopped by user", task_id)
                 await self._close_browser()
                 result["stopped"] = True
                 if not result.get("error"):
-                    result["error"] = "Stopped by user"
+                    result["error"] = _STOPPED_RESULT["error"]
                 return result
             
-            await self._send_log("info", "Finalizing...", task_id)
+            self._fire_log("info", "Finalizing...", task_id)
             
             # Add metadata
             result["url"] = url
             result["platform"] = platform
-            result["timestamp"] = datetime.utcnow().isoformat()
+            result["timestamp_ns"] = time.time_ns()
             
             if result.get("success"):
                 await self._send_progress(task_id, 100, "Complete")
@@ -369,13 +499,23 @@ class InboxHunterAgent:
             await self._close_browser()
             
             return result
+        
+        except _TaskStopped:
+            await self._close_browser()
+            return {**_STOPPED_RESULT, "url": url}
             
         except Exception as e:
-            logger.error(f"Signup error: {e}", exc_info=True)
+            self._log_exception("Signup error", e)
             await self._send_log("error", f"Signup error: {str(e)}", task_id)
             await self._close_browser()
             return {"success": False, "error": str(e), "url": url}
     
+    async def _check_stop(self, task_id: str, message: str = "Task stopped by user"):
+        """Raise _TaskStopped if a stop was requested for the current task."""
+        if self._stop_task_event.is_set():
+            await self._send_log("warning", message, task_id)
+            raise _TaskStopped()
+    
     async def _close_browser(self):
         """Close the browser instance."""
         if self._browser:
@@ -384,7 +524,7 @@ class InboxHunterAgent:
                 self._browser = None
                 logger.info("Browser closed")
             except Exception as e:
-                logger.debug(f"Error closing browser: {e}")
+                logger.debug("Error closing browser: {}", e)
     
     async def _send_progress(self, task_id: str, progress: int, current_step: str = None):
         """Send progress update to platform."""
@@ -397,7 +537,7 @@ class InboxHunterAgent:
                     current_step=current_step
                 )
             except Exception as e:
-                logger.debug(f"Failed to send progress: {e}")
+                logger.debug("Failed to send progress: {}", e)
     
     async def _execute_scrape_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -414,52 +554,46 @@ class InboxHunterAgent:
         params = task.get("params", {})
         
         self._emit_log(f"🔍 Starting scrape: {source}")
-        await self._send_log("info", f"Starting scrape from {source}", task_id)
-        
-        # Check stop before starting
-        if self._stop_task:
-            await self._send_log("warning", "Task stopped before starting", task_id)
-            return {"success": False, "error": "Stopped by user", "stopped": True}
-        
-        await self._send_log("info", "Initializing scraper...", task_id)
+        self._fire_log("info", f"Starting scrape from {source}", task_id)
         
         try:
+            # Check stop before starting
+            await self._check_stop(task_id, "Task stopped before starting")
+            
+            self._fire_log("info", "Initializing scraper...", task_id)
+            
             if source in ["meta", "meta_ads"]:
-                from src.scrapers.meta_ads import MetaAdsLibraryScraper
+                MetaAdsLibraryScraper = _meta_ads_scraper_cls()
                 
-                # Build config and set ad limit
-                config = self._build_legacy_config()
+                # Build config and set ad limit (copy, the base config is shared)
+                base = self._build_legacy_config()
                 limit = params.get("limit", 50)
-                config.sources.meta_ads_library.ad_limit = limit
-                config.sources.meta_ads_library.enabled = True
+                meta_ads = base.sources.meta_ads_library.model_copy(
+                    update={"ad_limit": limit, "enabled": True}
+                )
+                config = base.model_copy(update={
+                    "sources": base.sources.model_copy(update={"meta_ads_library": meta_ads})
+                })
                 
                 # Check stop before browser init
-                if self._stop_task:
-                    await self._send_log("warning", "Task stopped by user", task_id)
-                    return {"success": False, "error": "Stopped by user", "stopped": True}
-                
-                await self._send_log("info", "Starting browser for Meta Ads Library...", task_id)
-                
-                scraper = MetaAdsLibraryScraper(config, stop_check=lambda: self._stop_task)
-                await scraper.initialize()
-                
-                # Check stop after browser init
-                if self._stop_task:
-                    await scraper.close()
-                    await self._send_log("warning", "Task stopped by user", task_id)
-                    return {"success": False, "error": "Stopped by user", "stopped": True}
+                await self._check_stop(task_id)
                 
-                keywords = params.get("keywords", ["marketing"])
-                self._emit_log(f"🔎 Searching keywords: {', '.join(keywords)}")
-                await self._send_log("info", f"Searching keywords: {', '.join(keywords)}", task_id)
+                self._fire_log("info", "Starting browser for Meta Ads Library...", task_id)
                 
-                ads = await scraper.scrape_ads(keywords=keywords)
-                await scraper.close()
+                async with MetaAdsLibraryScraper(config, stop_event=self._stop_task_event) as scraper:
+                    # Check stop after browser init
+                    await self._check_stop(task_id)
+                    
+                    keywords = params.get("keywords", ["marketing"])
+                    self._emit_log(f"🔎 Searching keywords: {', '.join(keywords)}")
+                    self._fire_log("info", f"Searching keywords: {', '.join(keywords)}", task_id)
+                    
+                    ads = await scraper.scrape_ads(keywords=keywords)
                 
                 # Check if stopped during scraping
-                if self._stop_task:
+                if self._stop_task_event.is_set():
                     await self._send_log("warning", "Task stopped by user", task_id)
-                    return {"success": False, "error": "Stopped by user", "ads": ads, "count": len(ads), "stopped": True}
+                    return {**_STOPPED_RESULT, "ads": ads, "count": len(ads)}
                 
                 await self._send_progress(task_id, 80, f"Found {len(ads)} ads...")
                 self._emit_log(f"📊 Found {len(ads)} unique ads")
@@ -467,28 +601,15 @@ class InboxHunterAgent:
                 
                 # Send scraped links to platform via API
                 if ads and self._ws_client:
-                    links_data = [
-                        {
-                            "url": ad.get("url"),
-                            "title": ad.get("title"),
-                            "advertiserName": ad.get("advertiser_name"),
-                            "source": "meta_ads",
-                            "searchKeyword": ad.get("keyword"),
-                            "metadata": {
-                                "scraped_at": ad.get("scraped_at"),
-                                "description": ad.get("description")
-                            }
-                        }
-                        for ad in ads if ad.get("url")
-                    ]
-                    
                     await self._send_progress(task_id, 90, "Sending links to platform...")
-                    await self._send_log("info", f"Sending {len(links_data)} links to platform...", task_id)
+                    self._fire_log("info", "Sending links to platform...", task_id)
                     
                     # Send links back via WebSocket
-                    await self._ws_client.send_scraped_links(links_data, task_id=task_id)
-                    self._emit_log(f"📤 Sent {len(links_data)} links to platform")
-                    await self._send_log("success", f"Sent {len(links_data)} links to platform", task_id)
+                    sent = await self._ws_client.send_scraped_links(
+                        _iter_scraped_links(ads), task_id=task_id
+                    )
+                    self._emit_log(f"📤 Sent {sent} links to platform")
+                    await self._send_log("success", f"Sent {sent} links to platform", task_id)
                 
                 await self._send_progress(task_id, 100, "Complete")
                 
@@ -499,7 +620,7 @@ class InboxHunterAgent:
                 }
             
             elif source == "csv":
-                from src.scrapers.csv_parser import CSVDataParser
+                CSVDataParser = _csv_parser_cls()
                 
                 csv_path = params.get("path", "./data/training.csv")
                 parser = CSVDataParser(self._build_legacy_config())
@@ -514,9 +635,12 @@ class InboxHunterAgent:
             else:
                 await self._send_log("error", f"Unknown scrape source: {source}", task_id)
                 return {"success": False, "error": f"Unknown scrape source: {source}"}
+        
+        except _TaskStopped:
+            return dict(_STOPPED_RESULT)
                 
         except Exception as e:
-            logger.error(f"Scrape error: {e}", exc_info=True)
+            self._log_exception("Scrape error", e)
             await self._send_log("error", f"Scrape error: {str(e)}", task_id)
             return {"success": False, "error": str(e)}
     
@@ -524,6 +648,8 @@ class InboxHunterAgent:
         """Handle config update from platform."""
         self._emit_log("📥 Received config update from platform")
         self.config.update_from_platform(config_data)
+        self._default_credentials = None
+        self._legacy_config = None
     
     async def _handle_command(self, command: str, params: Dict[str, Any]):
         """
@@ -540,34 +666,73 @@ class InboxHunterAgent:
         cmd_type = params.get("type", command) if isinstance(params, dict) else command
         task_id = params.get("taskId") if isinstance(params, dict) else None
         
-        logger.warning(f"📥 Received command: {cmd_type}, task_id: {task_id}")
+        logger.warning("📥 Received command: {}, task_id: {}", cmd_type, task_id)
         self._emit_log(f"📥 Received command: {cmd_type}")
         
-        if cmd_type == "pause":
-            self._set_status(AgentStatus.PAUSED)
-            
-        elif cmd_type == "resume":
-            self._set_status(AgentStatus.CONNECTED)
-            
-        elif cmd_type in ["stop", "stop_task"]:
-            logger.warning("🛑 STOP COMMAND RECEIVED - Setting task stop flag")
-            self._stop_task = True
-            self._emit_log("🛑 Stop requested - stopping current task...")
-            # Send immediate feedback to UI
-            await self._send_log("warning", "🛑 Stop command received - stopping task...", task_id)
-            
-        elif cmd_type == "cancel_task":
-            logger.warning("❌ CANCEL COMMAND RECEIVED - Setting task stop flag")
-            self._stop_task = True
-            self._emit_log("❌ Cancel requested - stopping immediately...")
-            # Send immediate feedback to UI
-            await self._send_log("warning", "❌ Cancel command received - stopping immediately...", task_id)
-            
-        elif cmd_type == "restart":
-            await self.restart()
+        handler = self._command_handlers.get(cmd_type)
+        if handler:
+            await handler(task_id)
+    
+    async def _cmd_pause(self, task_id: Optional[str]):
+        """Pause task execution."""
+        self._set_status(AgentStatus.PAUSED)
+    
+    async def _cmd_resume(self, task_id: Optional[str]):
+        """Resume task execution."""
+        self._set_status(AgentStatus.CONNECTED)
+    
+    async def _cmd_stop(self, task_id: Optional[str]):
+        """Stop the current task."""
+        logger.warning("🛑 STOP COMMAND RECEIVED - Setting task stop flag")
+        self._stop_task_event.set()
+        self._emit_log("🛑 Stop requested - stopping current task...")
+        # Send immediate feedback to UI
+        await self._send_log("warning", "🛑 Stop command received - stopping task...", task_id)
+    
+    async def _cmd_cancel(self, task_id: Optional[str]):
+        """Cancel the current task immediately."""
+        logger.warning("❌ CANCEL COMMAND RECEIVED - Setting task stop flag")
+        self._stop_task_event.set()
+        self._emit_log("❌ Cancel requested - stopping immediately...")
+        # Send immediate feedback to UI
+        await self._send_log("warning", "❌ Cancel command received - stopping immediately...", task_id)
+    
+    async def _cmd_restart(self, task_id: Optional[str]):
+        """Restart the agent."""
+        await self.restart()
+    
+    def _get_default_credentials(self) -> Dict[str, Any]:
+        """
+        Signup credentials used when a task doesn't supply any.
+        
+        Built from config on first use and cached until the next config
+        update. The dict is shared between tasks and must not be mutated.
+        """
+        if self._default_credentials is None:
+            creds = self.config.credentials
+            self._default_credentials = {
+                "email": creds.email,
+                "first_name": creds.first_name,
+                "last_name": creds.last_name,
+                "full_name": creds.full_name,
+                "phone": {
+                    "country_code": creds.phone_country_code,
+                    "number": creds.phone_number,
+                    "full": creds.phone_full
+                }
+            }
+        return self._default_credentials
     
     def _build_legacy_config(self):
-        """Build legacy Config object for compatibility with existing automation code."""
+        """
+        Build legacy Config object for compatibility with existing automation code.
+        
+        The result is cached until the next platform config update; callers
+        that need different values must copy it rather than mutate it.
+        """
+        if self._legacy_config is not None:
+            return self._legacy_config
+        
         from src.config import Config, CredentialsConfig as LegacyCredentials
         from src.config import PhoneConfig, LLMConfig as LegacyLLM
         from src.config import CaptchaConfig as LegacyCaptcha
@@ -579,7 +744,7 @@ class InboxHunterAgent:
         from src.config import FormDetectionConfig, ErrorHandlingConfig, AppConfig
         from src.config import RateLimitingConfig
         
-        return Config(
+        self._legacy_config = Config(
             app=AppConfig(
                 name="InboxHunter Agent",
                 version="2.0.0",
@@ -631,15 +796,17 @@ class InboxHunterAgent:
             form_detection=FormDetectionConfig(),
             error_handling=ErrorHandlingConfig()
         )
+        return self._legacy_config
     
     async def run(self):
         """
         Main agent run loop.
         Connects to platform and processes tasks.
         """
-        self.stats["current_session_start"] = datetime.utcnow().isoformat()
+        self.stats.current_session_start = time.time_ns()
         self._stop_agent = False
-        self._stop_task = False
+        self._stop_task_event.clear()
+        self._stop_event.clear()
         
         self._emit_log("🚀 Starting InboxHunter Agent...")
         
@@ -650,35 +817,62 @@ class InboxHunterAgent:
             self._emit_log("⚠️ Running in offline mode")
             return
         
-        # Main loop - keep connection alive and process tasks
+        # Load task modules now so the first task doesn't pay the import cost
+        self._preload_task_modules()
+        
+        # Main loop - Socket.io dispatches tasks from its own reader, so
+        # just suspend until stop() is requested or the connection is lost
+        stop_waiter = asyncio.create_task(self._stop_event.wait())
+        connection_waiter = asyncio.create_task(self._ws_client.process_messages())
         try:
-            while not self._stop_agent:
-                if self._ws_client:
-                    await self._ws_client.process_messages()
-                await asyncio.sleep(0.1)
+            await asyncio.wait(
+                {stop_waiter, connection_waiter},
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if not self._stop_event.is_set():
+                self._emit_log("⚠️ Lost connection to platform")
                 
         except asyncio.CancelledError:
             self._emit_log("Agent loop cancelled")
         except Exception as e:
-            logger.error(f"Agent loop error: {e}", exc_info=True)
+            self._log_exception("Agent loop error", e)
             self._set_status(AgentStatus.ERROR)
         finally:
+            stop_waiter.cancel()
+            connection_waiter.cancel()
+            # Give a stopped task the same grace period stop() allows, so it
+            # can report its result before the browser and socket go away
+            await self._wait_for_task_done()
             await self.cleanup()
     
+    def _preload_task_modules(self):
+        """Import the browser/scraper modules used by tasks ahead of time."""
+        try:
+            _browser_automation_cls()
+            _orchestrator_cls()
+            _meta_ads_scraper_cls()
+        except ImportError as e:
+            logger.warning(f"Could not preload task modules: {e}")
+    
     async def stop(self):
         """Stop the agent gracefully."""
         self._emit_log("🛑 Stopping agent...")
         self._stop_agent = True
-        self._stop_task = True  # Also stop any running task
+        self._stop_task_event.set()  # Also stop any running task
+        self._stop_event.set()
         self._set_status(AgentStatus.STOPPING)
         
         # Wait for current task to complete
-        if self._current_task:
+        if not self._task_done_event.is_set():
             self._emit_log("Waiting for current task to complete...")
-            for _ in range(30):  # Wait up to 30 seconds
-                if self._current_task is None:
-                    break
-                await asyncio.sleep(1)
+            await self._wait_for_task_done()
+    
+    async def _wait_for_task_done(self):
+        """Wait up to TASK_STOP_TIMEOUT seconds for the running task to finish."""
+        try:
+            await asyncio.wait_for(self._task_done_event.wait(), timeout=self.TASK_STOP_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
     
     async def restart(self):
         """Restart the agent."""
@@ -705,15 +899,15 @@ class InboxHunterAgent:
     
     def is_running(self) -> bool:
         """Check if agent is currently running."""
-        return self.status in [AgentStatus.CONNECTED, AgentStatus.RUNNING]
+        return self.status in _RUNNING_STATES
     
     def get_status(self) -> Dict[str, Any]:
         """Get current agent status."""
         return {
-            "status": self.status.value,
+            "status": self._status_str,
             "agent_id": self.config.agent_id,
-            "current_task": self._current_task.get("task_id") if self._current_task else None,
-            "stats": self.stats,
+            "current_task": self._current_task_id,
+            "stats": self.stats.snapshot(),
             "connected": self._ws_client is not None and self._ws_client.is_connected
         }
 
@@ -3,17 +3,22 @@ Agent configuration management.
 Handles local config storage and platform config sync.
 """
 
-import json
 import os
-import yaml
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 from pydantic import BaseModel, Field
 from loguru import logger
 
 
+@lru_cache(maxsize=None)
 def get_data_dir() -> Path:
-    """Get the application data directory based on OS."""
+    """
+    Get the application data directory based on OS.
+    
+    Resolved and created once per process; call get_data_dir.cache_clear()
+    if the directory may have been removed.
+    """
     if os.name == 'nt':  # Windows
         base = Path(os.environ.get('APPDATA', Path.home()))
     elif os.name == 'posix':
@@ -72,6 +77,89 @@ class CaptchaConfig(BaseModel):
     timeout: int = 120
 
 
+# YAML configs to merge, in priority order (only the first existing one is used)
+_YAML_PATHS = (
+    Path("config/config.yaml"),
+    Path(__file__).parent.parent.parent / "config" / "config.yaml",
+)
+
+
+@lru_cache(maxsize=None)
+def _yaml_load() -> Callable[[Any], Any]:
+    """Import PyYAML on first use; return yaml.load bound to the libyaml-backed loader when built."""
+    import yaml
+    return partial(yaml.load, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def _write_bytes_atomic(path: Path, payload: bytes):
+    """Write to a temp file and swap it in so readers never see a torn file."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+# Platform phone sub-dict keys -> flat CredentialsConfig fields
+_PHONE_FIELDS = {
+    "country_code": "phone_country_code",
+    "number": "phone_number",
+    "full": "phone_full",
+}
+
+
+def _known_fields(model: type, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only non-None values for fields declared on the model."""
+    fields = model.model_fields
+    return {k: v for k, v in data.items() if v is not None and k in fields}
+
+
+def _section_update(model: type, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a model_copy update for a config section from raw YAML/platform data."""
+    if model is not CredentialsConfig:
+        return _known_fields(model, data)
+    # Credentials carry the phone as a nested dict; the model stores it flat
+    creds = dict(data)
+    phone = creds.pop("phone", None) or {}
+    update = _known_fields(CredentialsConfig, creds)
+    for key, field in _PHONE_FIELDS.items():
+        if phone.get(key) is not None:
+            update[field] = phone[key]
+    return update
+
+
+def _yaml_llm_wanted(section: Dict[str, Any], config: "AgentConfig") -> bool:
+    # Only override if YAML has a real API key
+    api_key = section.get("api_key")
+    return bool(api_key) and api_key != "YOUR_OPENAI_API_KEY"
+
+
+def _yaml_captcha_wanted(section: Dict[str, Any], config: "AgentConfig") -> bool:
+    return bool(section.get("api_key"))
+
+
+def _yaml_platform_wanted(section: Dict[str, Any], config: "AgentConfig") -> bool:
+    # Only override platform URLs if not already set from registration
+    return not config.platform.api_url or config.platform.api_url == "http://localhost:3001"
+
+
+# YAML section -> (section model, optional guard deciding whether to merge it)
+_YAML_MERGE = (
+    ("llm", LLMConfig, _yaml_llm_wanted),
+    ("captcha", CaptchaConfig, _yaml_captcha_wanted),
+    ("credentials", CredentialsConfig, None),
+    ("automation", AutomationConfig, None),
+    ("platform", PlatformConfig, _yaml_platform_wanted),
+)
+
+# Sections the platform is allowed to push via update_from_platform
+_PLATFORM_SECTIONS = (
+    ("credentials", CredentialsConfig),
+    ("llm", LLMConfig),
+    ("captcha", CaptchaConfig),
+    ("automation", AutomationConfig),
+)
+
+
 class AgentConfig(BaseModel):
     """Main agent configuration."""
     # Agent identity
@@ -103,86 +191,36 @@ class AgentConfig(BaseModel):
         config = cls()
         
         # Load from JSON (agent_config.json - has agent_id and agent_token)
-        if config_path.exists():
-            try:
-                with open(config_path, 'r') as f:
-                    data = json.load(f)
-                config = cls(**data)
-            except Exception as e:
-                logger.warning(f"Failed to load JSON config: {e}")
+        try:
+            with open(config_path, 'rb') as f:
+                config = cls.model_validate_json(f.read())
+        except FileNotFoundError:
+            pass  # Not registered yet
+        except Exception as e:
+            logger.warning(f"Failed to load JSON config: {e}")
         
         # Also load from YAML config (config/config.yaml - has API keys, credentials)
-        yaml_paths = [
-            Path("config/config.yaml"),
-            Path(__file__).parent.parent.parent / "config" / "config.yaml",
-        ]
-        
-        for yaml_path in yaml_paths:
-            if yaml_path.exists():
-                try:
-                    with open(yaml_path, 'r') as f:
-                        yaml_data = yaml.safe_load(f) or {}
-                    
-                    # Merge YAML settings into config (YAML takes priority for API keys)
-                    if "llm" in yaml_data:
-                        llm = yaml_data["llm"]
-                        # Only override if YAML has a non-empty API key
-                        if llm.get("api_key") and llm.get("api_key") != "YOUR_OPENAI_API_KEY":
-                            config.llm = LLMConfig(
-                                enabled=llm.get("enabled", config.llm.enabled),
-                                provider=llm.get("provider", config.llm.provider),
-                                api_key=llm.get("api_key", config.llm.api_key),
-                                model=llm.get("model", config.llm.model)
-                            )
-                    
-                    if "captcha" in yaml_data:
-                        captcha = yaml_data["captcha"]
-                        if captcha.get("api_key"):
-                            config.captcha = CaptchaConfig(
-                                service=captcha.get("service", config.captcha.service),
-                                api_key=captcha.get("api_key", config.captcha.api_key),
-                                timeout=captcha.get("timeout", config.captcha.timeout)
-                            )
-                    
-                    if "credentials" in yaml_data:
-                        creds = yaml_data["credentials"]
-                        phone = creds.get("phone", {})
-                        config.credentials = CredentialsConfig(
-                            first_name=creds.get("first_name", config.credentials.first_name),
-                            last_name=creds.get("last_name", config.credentials.last_name),
-                            full_name=creds.get("full_name", config.credentials.full_name),
-                            email=creds.get("email", config.credentials.email),
-                            phone_country_code=phone.get("country_code", config.credentials.phone_country_code),
-                            phone_number=phone.get("number", config.credentials.phone_number),
-                            phone_full=phone.get("full", config.credentials.phone_full)
-                        )
-                    
-                    if "automation" in yaml_data:
-                        auto = yaml_data["automation"]
-                        config.automation = AutomationConfig(
-                            headless=auto.get("headless", config.automation.headless),
-                            browser=auto.get("browser", config.automation.browser),
-                            viewport_width=auto.get("viewport_width", config.automation.viewport_width),
-                            viewport_height=auto.get("viewport_height", config.automation.viewport_height),
-                            stealth_enabled=auto.get("stealth_enabled", config.automation.stealth_enabled),
-                            typing_delay_min=auto.get("typing_delay_min", config.automation.typing_delay_min),
-                            typing_delay_max=auto.get("typing_delay_max", config.automation.typing_delay_max)
-                        )
-                    
-                    if "platform" in yaml_data:
-                        platform = yaml_data["platform"]
-                        # Only override platform URLs if not already set from registration
-                        if not config.platform.api_url or config.platform.api_url == "http://localhost:3001":
-                            config.platform = PlatformConfig(
-                                api_url=platform.get("api_url", config.platform.api_url),
-                                ws_url=platform.get("ws_url", config.platform.ws_url)
-                            )
-                    
-                    logger.debug(f"Merged YAML config from {yaml_path}")
-                    break  # Only load from first found YAML
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to load YAML config from {yaml_path}: {e}")
+        for yaml_path in _YAML_PATHS:
+            try:
+                with open(yaml_path, 'r') as f:
+                    yaml_data = _yaml_load()(f) or {}
+                
+                # Merge YAML settings into config (YAML takes priority for API keys)
+                for key, model, wanted in _YAML_MERGE:
+                    section = yaml_data.get(key)
+                    if not section or (wanted and not wanted(section, config)):
+                        continue
+                    setattr(config, key, getattr(config, key).model_copy(
+                        update=_section_update(model, section)
+                    ))
+                
+                logger.debug(f"Merged YAML config from {yaml_path}")
+                break  # Only load from first found YAML
+                
+            except FileNotFoundError:
+                continue  # Not present; try the next one
+            except Exception as e:
+                logger.warning(f"Failed to load YAML config from {yaml_path}: {e}")
         
         return config
     
@@ -193,71 +231,34 @@ class AgentConfig(BaseModel):
         
         config_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(config_path, 'w') as f:
-            json.dump(self.model_dump(), f, indent=2)
+        _write_bytes_atomic(config_path, self.model_dump_json(indent=2).encode("utf-8"))
         
         logger.debug(f"Config saved to {config_path}")
     
     def update_from_platform(self, platform_config: Dict[str, Any]):
-        """Update config with settings from platform."""
-        if "credentials" in platform_config:
-            creds = platform_config["credentials"]
-            self.credentials = CredentialsConfig(
-                first_name=creds.get("first_name", ""),
-                last_name=creds.get("last_name", ""),
-                full_name=creds.get("full_name", ""),
-                email=creds.get("email", ""),
-                phone_country_code=creds.get("phone", {}).get("country_code", "+1"),
-                phone_number=creds.get("phone", {}).get("number", ""),
-                phone_full=creds.get("phone", {}).get("full", "")
-            )
-        
-        if "llm" in platform_config:
-            llm = platform_config["llm"]
-            self.llm = LLMConfig(
-                enabled=llm.get("enabled", True),
-                provider=llm.get("provider", "openai"),
-                api_key=llm.get("api_key", ""),
-                model=llm.get("model", "gpt-4o")
-            )
+        """
+        Update config with settings from platform.
         
-        if "captcha" in platform_config:
-            captcha = platform_config["captcha"]
-            self.captcha = CaptchaConfig(
-                service=captcha.get("service", "2captcha"),
-                api_key=captcha.get("api_key", ""),
-                timeout=captcha.get("timeout", 120)
-            )
-        
-        if "automation" in platform_config:
-            auto = platform_config["automation"]
-            self.automation = AutomationConfig(
-                headless=auto.get("headless", False),
-                browser=auto.get("browser", "chromium"),
-                viewport_width=auto.get("viewport_width", 1920),
-                viewport_height=auto.get("viewport_height", 1080),
-                stealth_enabled=auto.get("stealth_enabled", True)
-            )
+        Only fields the platform actually sends are changed; everything
+        else keeps its current value.
+        """
+        for key, model in _PLATFORM_SECTIONS:
+            if key in platform_config:
+                setattr(self, key, getattr(self, key).model_copy(
+                    update=_section_update(model, platform_config[key])
+                ))
         
         self.save()
         logger.info("Config updated from platform")
 
 
-# Global config instance
-_agent_config: Optional[AgentConfig] = None
-
-
+@lru_cache(maxsize=None)
 def get_agent_config() -> AgentConfig:
-    """Get global agent configuration."""
-    global _agent_config
-    if _agent_config is None:
-        _agent_config = AgentConfig.load()
-    return _agent_config
+    """Get global agent configuration (loaded once per process)."""
+    return AgentConfig.load()
 
 
 def reload_agent_config() -> AgentConfig:
     """Reload agent configuration from file."""
-    global _agent_config
-    _agent_config = AgentConfig.load()
-    return _agent_config
-
+    get_agent_config.cache_clear()
+    return get_agent_config()
@@ -11,11 +11,13 @@ import tempfile
 import shutil
 from pathlib import Path
 from typing import Optional, Dict, Any, Callable
-import httpx
 from loguru import logger
 
 from .config import get_data_dir
 
+# Read size for streamed downloads (also drives progress callback granularity)
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 class AgentUpdater:
     """
@@ -52,12 +54,30 @@ class AgentUpdater:
         self.on_update_complete = on_update_complete
         
         self._update_info: Optional[Dict[str, Any]] = None
+        self._client = None  # httpx.AsyncClient, created on first request
     
     @property
     def current_version(self) -> str:
         """Get current agent version."""
         return self.VERSION
     
+    def _get_client(self):
+        """Get the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            # Only needed when actually talking to the platform
+            import httpx
+            self._client = httpx.AsyncClient(
+                timeout=30,
+                limits=httpx.Limits(max_keepalive_connections=4)
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     async def check_for_updates(self) -> Optional[Dict[str, Any]]:
         """
         Check platform for available updates.
@@ -66,31 +86,30 @@ class AgentUpdater:
             Update info dict if update available, None otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.get(
-                    f"{self.api_url}/agent/version",
-                    params={"current_version": self.VERSION}
-                )
+            response = await self._get_client().get(
+                f"{self.api_url}/agent/version",
+                params={"current_version": self.VERSION}
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
                 
-                if response.status_code == 200:
-                    data = response.json()
+                if data.get("update_available"):
+                    self._update_info = data
+                    new_version = data.get("latest_version")
                     
-                    if data.get("update_available"):
-                        self._update_info = data
-                        new_version = data.get("latest_version")
-                        
-                        logger.info(f"Update available: {self.VERSION} → {new_version}")
-                        
-                        if self.on_update_available:
-                            self.on_update_available(new_version)
-                        
-                        return data
-                    else:
-                        logger.debug("No updates available")
-                        return None
+                    logger.info(f"Update available: {self.VERSION} → {new_version}")
+                    
+                    if self.on_update_available:
+                        self.on_update_available(new_version)
+                    
+                    return data
                 else:
-                    logger.warning(f"Update check failed: {response.status_code}")
+                    logger.debug("No updates available")
                     return None
+            else:
+                logger.warning(f"Update check failed: {response.status_code}")
+                return None
                     
         except Exception as e:
             logger.error(f"Update check error: {e}")
@@ -131,27 +150,30 @@ class AgentUpdater:
             
             logger.info(f"Downloading update from {download_url}")
             
-            async with httpx.AsyncClient(timeout=300) as client:
-                async with client.stream("GET", download_url) as response:
-                    if response.status_code != 200:
-                        logger.error(f"Download failed: {response.status_code}")
-                        return None
-                    
-                    total_size = int(response.headers.get("content-length", 0))
-                    downloaded = 0
-                    
-                    with open(download_path, "wb") as f:
-                        async for chunk in response.aiter_bytes(chunk_size=8192):
-                            f.write(chunk)
-                            downloaded += len(chunk)
-                            
-                            if total_size > 0 and self.on_update_progress:
-                                progress = int((downloaded / total_size) * 100)
-                                self.on_update_progress(progress)
+            client = self._get_client()
+            async with client.stream("GET", download_url, timeout=300) as response:
+                if response.status_code != 200:
+                    logger.error(f"Download failed: {response.status_code}")
+                    return None
+                
+                total_size = int(response.headers.get("content-length", 0))
+                downloaded = 0
+                # Hash while writing so the file doesn't have to be read back
+                sha256 = hashlib.sha256()
+                
+                with open(download_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        sha256.update(chunk)
+                        downloaded += len(chunk)
+                        
+                        if total_size > 0 and self.on_update_progress:
+                            progress = int((downloaded / total_size) * 100)
+                            self.on_update_progress(progress)
             
             # Verify checksum if provided
             if expected_checksum:
-                actual_checksum = self._calculate_checksum(download_path)
+                actual_checksum = sha256.hexdigest()
                 if actual_checksum != expected_checksum:
                     logger.error(f"Checksum mismatch: expected {expected_checksum}, got {actual_checksum}")
                     download_path.unlink()
@@ -165,14 +187,6 @@ class AgentUpdater:
             logger.error(f"Download error: {e}")
             return None
     
-    def _calculate_checksum(self, file_path: Path) -> str:
-        """Calculate SHA256 checksum of a file."""
-        sha256 = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                sha256.update(chunk)
-        return sha256.hexdigest()
-    
     async def apply_update(self, update_path: Path) -> bool:
         """
         Apply the downloaded update.
@@ -265,6 +279,11 @@ del "%~f0"
         if not update_info:
             return False
         
+        # apply_update is a no-op outside frozen builds, so skip the download
+        if not getattr(sys, 'frozen', False):
+            logger.info("Update available (dev mode, not downloading)")
+            return False
+        
         # Download
         update_path = await self.download_update()
         if not update_path:
@@ -277,6 +296,7 @@ del "%~f0"
         
         # Restart the application
         logger.info("Restarting application...")
+        await self.aclose()
         
         if sys.platform == "win32":
             # On Windows, the batch script handles restart
@@ -295,13 +315,21 @@ async def check_for_updates_background(interval_hours: int = 6):
     Args:
         interval_hours: Hours between update checks
     """
+    # Updates can only be applied to frozen builds; don't poll in dev mode
+    if not getattr(sys, 'frozen', False):
+        logger.debug("Dev mode, skipping background update checks")
+        return
+    
     updater = AgentUpdater()
     
-    while True:
-        try:
-            await updater.check_for_updates()
-        except Exception as e:
-            logger.error(f"Background update check error: {e}")
-        
-        await asyncio.sleep(interval_hours * 3600)
+    try:
+        while True:
+            try:
+                await updater.check_for_updates()
+            except Exception as e:
+                logger.error(f"Background update check error: {e}")
+            
+            await asyncio.sleep(interval_hours * 3600)
+    finally:
+        await updater.aclose()
 
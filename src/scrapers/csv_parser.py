@@ -5,13 +5,27 @@ Reads ad URLs from training.csv file.
 
 import csv
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Iterator, List, Dict, Any
 from datetime import datetime
 
 from loguru import logger
 
 from src.config import Config
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# Below this size the stdlib reader wins; pyarrow's setup cost dominates
+PYARROW_MIN_FILE_SIZE = 1024 * 1024
+
+# Columns read from training.csv
+CSV_COLUMNS = ('url', 'title', 'description', 'keyword', 'source', 'scraped_at')
+
 
 class CSVDataParser:
     """Parse ad data from training.csv"""
@@ -26,43 +40,124 @@ class CSVDataParser:
         self.config = config
         self.csv_path = Path(config.sources.csv_data.data_path)
     
-    def parse(self) -> List[Dict[str, Any]]:
+    def iter_ads(self) -> Iterator[Dict[str, Any]]:
         """
-        Parse ads from CSV file.
+        Yield ads from the CSV file one at a time.
         
-        Returns:
-            List of ad data dictionaries
+        Large files are read with pyarrow's C++ CSV reader when it is
+        installed; otherwise the stdlib csv module streams the file.
+        
+        Yields:
+            Ad data dictionaries
         """
         if not self.csv_path.exists():
             logger.warning(f"CSV file not found: {self.csv_path}")
-            return []
+            return
         
-        ads = []
+        if PYARROW_AVAILABLE and self.csv_path.stat().st_size >= PYARROW_MIN_FILE_SIZE:
+            yield from self._iter_with_pyarrow()
+        else:
+            yield from self._iter_with_csv()
+    
+    def parse_all(self) -> List[Dict[str, Any]]:
+        """
+        Parse all ads from CSV file.
         
+        Returns:
+            List of ad data dictionaries
+        """
         try:
-            with open(self.csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                
-                for row in reader:
-                    # Skip rows with empty URLs
-                    if not row.get('url') or not row['url'].strip():
-                        continue
-                    
-                    ad_data = {
-                        'url': row['url'].strip(),
-                        'title': row.get('title', '').strip(),
-                        'description': row.get('description', '').strip(),
-                        'keyword': row.get('keyword', '').strip(),
-                        'source': row.get('source', 'csv').strip(),
-                        'scraped_at': row.get('scraped_at', datetime.utcnow().isoformat())
-                    }
-                    ads.append(ad_data)
-            
+            ads = list(self.iter_ads())
             logger.success(f"✅ Loaded {len(ads)} ads from training.csv")
-            
+        
         except Exception as e:
             logger.error(f"Error parsing CSV file: {e}")
             return []
         
         return ads
-
+    
+    # Kept for existing callers
+    parse = parse_all
+    
+    def _iter_with_csv(self) -> Iterator[Dict[str, Any]]:
+        """Stream the file row by row with the stdlib csv module."""
+        with open(self.csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            width = len(header)
+            
+            # Resolve column positions once instead of building a dict per row
+            columns = {name: i for i, name in enumerate(header)}
+            url_i = columns.get('url')
+            title_i = columns.get('title')
+            description_i = columns.get('description')
+            keyword_i = columns.get('keyword')
+            source_i = columns.get('source')
+            scraped_at_i = columns.get('scraped_at')
+            
+            # One load time for every row lacking its own scraped_at
+            default_scraped_at = datetime.utcnow().isoformat()
+            
+            if url_i is None:
+                logger.warning(f"CSV file has no 'url' column: {self.csv_path}")
+                return
+            
+            for row in reader:
+                if len(row) < width:
+                    row.extend([''] * (width - len(row)))
+                
+                # Skip rows with empty URLs
+                url = row[url_i].strip()
+                if not url:
+                    continue
+                
+                yield {
+                    'url': url,
+                    'title': row[title_i].strip() if title_i is not None else '',
+                    'description': row[description_i].strip() if description_i is not None else '',
+                    'keyword': row[keyword_i].strip() if keyword_i is not None else '',
+                    'source': row[source_i].strip() if source_i is not None else 'csv',
+                    'scraped_at': (row[scraped_at_i] if scraped_at_i is not None else '') or default_scraped_at
+                }
+    
+    def _iter_with_pyarrow(self) -> Iterator[Dict[str, Any]]:
+        """Stream the file with pyarrow's reader, one record batch at a time."""
+        with open(self.csv_path, 'r', encoding='utf-8', newline='') as f:
+            header = next(csv.reader(f), [])
+        if 'url' not in header:
+            logger.warning(f"CSV file has no 'url' column: {self.csv_path}")
+            return
+        
+        reader = pa_csv.open_csv(
+            self.csv_path,
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                # Keep everything as text, exactly like the csv module would
+                column_types={name: pa.string() for name in CSV_COLUMNS},
+                include_columns=list(CSV_COLUMNS),
+                include_missing_columns=True,
+            ),
+        )
+        
+        default_scraped_at = datetime.utcnow().isoformat()
+        
+        # Only the current batch is decoded, so memory stays bounded on large files
+        with reader:
+            for batch in reader:
+                data = batch.to_pydict()
+                for url, title, description, keyword, source, scraped_at in zip(
+                    *(data[name] for name in CSV_COLUMNS)
+                ):
+                    # Skip rows with empty URLs
+                    url = (url or '').strip()
+                    if not url:
+                        continue
+                    
+                    yield {
+                        'url': url,
+                        'title': (title or '').strip(),
+                        'description': (description or '').strip(),
+                        'keyword': (keyword or '').strip(),
+                        'source': source.strip() if source is not None else 'csv',
+                        'scraped_at': scraped_at or default_scraped_at
+                    }
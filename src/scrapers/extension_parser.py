@@ -3,13 +3,38 @@ Parser for browser extension data (My Ad Finder, Turbo Ad Finder).
 """
 
 import json
+import mmap
+import os
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Iterable, Iterator, List, Dict, Any, Optional
 from datetime import datetime
 
 from loguru import logger
 
 from src.config import Config
+from src.utils.helpers import canonical_url
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+
+# Exports at least this big are streamed with ijson instead of loaded whole
+IJSON_MIN_FILE_SIZE = 50 * 1024 * 1024
+
+# Exports at least this big are memory-mapped for orjson instead of read into a bytes copy
+MMAP_MIN_FILE_SIZE = 16 * 1024 * 1024
+
+# Keys under which a wrapping JSON object may hold the ad list, in priority order
+_AD_LIST_KEYS = ('ads', 'data', 'results')
 
 
 class ExtensionDataParser:
@@ -18,15 +43,17 @@ class ExtensionDataParser:
     Supports various data formats (JSON, CSV, etc.).
     """
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, include_raw: bool = False):
         """
         Initialize extension data parser.
         
         Args:
             config: Application configuration
+            include_raw: Keep each ad's original extension record under "raw_data"
         """
         self.config = config
         self.sources = config.sources
+        self.include_raw = include_raw
     
     def parse_my_ad_finder(self) -> List[Dict[str, Any]]:
         """
@@ -89,16 +116,13 @@ class ExtensionDataParser:
         Returns:
             Combined list of ad data from all sources
         """
-        all_ads = []
-        
-        # Parse My Ad Finder
-        all_ads.extend(self.parse_my_ad_finder())
-        
-        # Parse Turbo Ad Finder
-        all_ads.extend(self.parse_turbo_ad_finder())
+        # Deduplicate by URL while collecting, instead of in a second pass
+        unique_ads = []
+        seen_urls = set()
         
-        # Remove duplicates
-        unique_ads = self._deduplicate_ads(all_ads)
+        # Merge in a fixed order so duplicates resolve the same way every run
+        self._extend_unique(unique_ads, seen_urls, self.parse_my_ad_finder())
+        self._extend_unique(unique_ads, seen_urls, self.parse_turbo_ad_finder())
         
         logger.success(f"✅ Total unique ads from extensions: {len(unique_ads)}")
         return unique_ads
@@ -114,40 +138,103 @@ class ExtensionDataParser:
         Returns:
             List of standardized ad data
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if IJSON_AVAILABLE and file_path.stat().st_size >= IJSON_MIN_FILE_SIZE:
+            ads = self._stream_json_ads(file_path)
+        else:
+            ads = self._load_json_ads(file_path)
+        
+        # Standardize ad data format (all ads in one file share a scrape time)
+        scraped_at = datetime.utcnow().isoformat()
+        standardized_ads = []
+        append = standardized_ads.append
+        standardize = self._standardize_ad_data
+        for ad in ads:
+            standardized_ad = standardize(ad, source, scraped_at)
+            if standardized_ad is not None:
+                append(standardized_ad)
+        
+        return standardized_ads
+    
+    def _load_json_ads(self, file_path: Path) -> Iterable[Dict[str, Any]]:
+        """
+        Load a JSON export into memory and return its raw ad records.
+        
+        Args:
+            file_path: Path to JSON file
+            
+        Returns:
+            Raw ad records (empty if the structure is not recognized)
+        """
+        with open(file_path, 'rb') as f:
+            if ORJSON_AVAILABLE and os.fstat(f.fileno()).st_size >= MMAP_MIN_FILE_SIZE:
+                # orjson parses straight from the mapped pages, skipping the copy
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    data = orjson.loads(view)
+            else:
+                raw = f.read()
+                data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
         
         # Handle different JSON structures
         if isinstance(data, list):
-            ads = data
+            return data
         elif isinstance(data, dict):
             # Try common key names
-            ads = (
-                data.get('ads') or 
-                data.get('data') or 
-                data.get('results') or 
-                [data]
-            )
+            for key in _AD_LIST_KEYS:
+                if data.get(key):
+                    return data[key]
+            return [data]
         else:
             logger.error(f"Unexpected JSON structure in {file_path}")
             return []
+    
+    def _stream_json_ads(self, file_path: Path) -> Iterator[Dict[str, Any]]:
+        """
+        Stream raw ad records from a large JSON export one at a time.
         
-        # Standardize ad data format
-        standardized_ads = []
-        for ad in ads:
-            standardized_ad = self._standardize_ad_data(ad, source)
-            if standardized_ad:
-                standardized_ads.append(standardized_ad)
+        Handles the same layouts as _load_json_ads without holding the
+        whole document in memory; a wrapping object without a non-empty
+        ad list falls back to a full load.
         
-        return standardized_ads
+        Args:
+            file_path: Path to JSON file
+            
+        Yields:
+            Raw ad records
+        """
+        with open(file_path, 'rb') as f:
+            head = f.read(64).lstrip(b'\xef\xbb\xbf \t\r\n')
+        
+        if head.startswith(b'['):
+            prefixes = ('item',)
+        elif head.startswith(b'{'):
+            prefixes = tuple(f"{key}.item" for key in _AD_LIST_KEYS)
+        else:
+            prefixes = ()
+        
+        for prefix in prefixes:
+            found = False
+            with open(file_path, 'rb') as f:
+                for ad in ijson.items(f, prefix, use_float=True):
+                    found = True
+                    yield ad
+            if found:
+                return
+        
+        yield from self._load_json_ads(file_path)
     
-    def _standardize_ad_data(self, ad_data: Dict[str, Any], source: str) -> Optional[Dict[str, Any]]:
+    def _standardize_ad_data(
+        self,
+        ad_data: Dict[str, Any],
+        source: str,
+        scraped_at: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Standardize ad data to common format.
         
         Args:
             ad_data: Raw ad data from extension
             source: Source identifier
+            scraped_at: Timestamp for the batch (defaults to now)
             
         Returns:
             Standardized ad data or None if invalid
@@ -163,7 +250,8 @@ class ExtensionDataParser:
         )
         
         if not url:
-            logger.debug(f"No URL found in ad data: {ad_data}")
+            # Lazy so the record is only repr'd when DEBUG is actually enabled
+            logger.opt(lazy=True).debug("No URL found in ad data: {}", lambda: ad_data)
             return None
         
         # Extract other fields
@@ -186,15 +274,39 @@ class ExtensionDataParser:
         # Create standardized ad data
         standardized = {
             "url": url,
-            "title": title[:200] if title else "",
-            "description": description[:500] if description else "",
+            "title": title[:200],
+            "description": description[:500],
             "source": source,
-            "scraped_at": datetime.utcnow().isoformat(),
-            "raw_data": ad_data  # Keep original data for reference
+            "scraped_at": scraped_at or datetime.utcnow().isoformat()
         }
         
+        if self.include_raw:
+            standardized["raw_data"] = ad_data  # Keep original data for reference
+        
         return standardized
     
+    @staticmethod
+    def _extend_unique(unique_ads: List[Dict[str, Any]], seen_urls: set, ads: List[Dict[str, Any]]):
+        """
+        Append ads whose canonical URL hasn't been seen yet.
+        
+        Args:
+            unique_ads: List being built, extended in place
+            seen_urls: Canonical URLs already in unique_ads, updated in place
+            ads: Newly parsed ads
+        """
+        add_seen = seen_urls.add
+        append = unique_ads.append
+        
+        for ad in ads:
+            url = ad.get("url", "")
+            if not url:
+                continue
+            key = canonical_url(url)
+            if key not in seen_urls:
+                add_seen(key)
+                append(ad)
+    
     def _deduplicate_ads(self, ads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Remove duplicate ads based on URL.
@@ -205,15 +317,8 @@ class ExtensionDataParser:
         Returns:
             List of unique ads
         """
-        seen_urls = set()
         unique_ads = []
-        
-        for ad in ads:
-            url = ad.get("url", "")
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique_ads.append(ad)
-        
+        self._extend_unique(unique_ads, set(), ads)
         return unique_ads
     
     @staticmethod
@@ -251,11 +356,15 @@ class ExtensionDataParser:
         data_dir.mkdir(exist_ok=True)
         
         # Write sample files
-        with open(data_dir / "my_ad_finder.json", 'w') as f:
-            json.dump(sample_my_ad_finder, f, indent=2)
-        
-        with open(data_dir / "turbo_ad_finder.json", 'w') as f:
-            json.dump(sample_turbo_ad_finder, f, indent=2)
+        for file_name, sample in (
+            ("my_ad_finder.json", sample_my_ad_finder),
+            ("turbo_ad_finder.json", sample_turbo_ad_finder),
+        ):
+            if ORJSON_AVAILABLE:
+                payload = orjson.dumps(sample, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(sample, indent=2).encode('utf-8')
+            (data_dir / file_name).write_bytes(payload)
         
         logger.info("Sample data files created in data/ directory")
 
@@ -3,17 +3,137 @@ Meta Ads Library scraper for extracting ad links.
 """
 
 import asyncio
+import hashlib
+import io
+import json
+import os
+import random
+import time
 import re
 import csv
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from urllib.parse import urlsplit
 
-from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Response
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
 from loguru import logger
 
 from src.config import Config
 from src.automation.browser import ensure_browsers_installed
+from src.utils.helpers import canonical_url, wait_or_stop
+from .csv_parser import CSV_COLUMNS
+
+
+# Only anchor hrefs are read, so these are never needed to scrape the results
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+# Analytics/tracking hosts (and their subdomains) requested by the Ads Library page
+_BLOCKED_HOSTS = (
+    "doubleclick.net",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "connect.facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "sentry.io",
+)
+
+# Meta's pixel endpoint lives on the main site, so it's matched by host and path
+_PIXEL_HOSTS = frozenset({"facebook.com", "www.facebook.com"})
+_PIXEL_PATH = "/tr"
+
+
+def _is_tracking_request(url: str) -> bool:
+    """Whether a request URL targets a blocked analytics host or the Meta pixel."""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return False
+    hostname = parts.hostname or ""
+    if hostname in _PIXEL_HOSTS:
+        return parts.path == _PIXEL_PATH or parts.path.startswith(_PIXEL_PATH + "/")
+    return any(hostname == host or hostname.endswith("." + host) for host in _BLOCKED_HOSTS)
+
+
+async def _block_unneeded_requests(route):
+    """Abort heavy or tracking requests; let everything else through."""
+    request = route.request
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES or _is_tracking_request(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# Navigation statuses meaning "slow down" rather than "broken"
+_THROTTLED_STATUSES = frozenset({429, 503})
+
+# Hosts (and their subdomains) that are Meta-internal or social links, never ad destinations
+_EXCLUDED_HOST_RE = re.compile(
+    r"(?:^|\.)(?:facebook\.com|fb\.com|instagram\.com|messenger\.com|meta\.com|fbcdn\.net"
+    r"|youtube\.com|youtu\.be|twitter\.com|linkedin\.com|tiktok\.com)$"
+)
+
+# Path prefixes of pages that are never ads
+_EXCLUDED_PATH_RE = re.compile(r"/(?:terms|privacy|help|about|legal|support|ads-transparency)")
+
+# Scrolls to the bottom and returns the page height before any new content loads
+_SCROLL_TO_BOTTOM_JS = """
+() => {
+    const height = document.body.scrollHeight;
+    window.scrollTo(0, height);
+    return height;
+}
+"""
+
+# Call-to-action labels on ad cards, in the order they are searched
+_ACTION_LABELS = (
+    "Sign up", "Learn more", "Shop now", "Order now", "Get started",
+    "Visit profile", "Book now", "Download", "Apply now", "Get offer",
+    "Join now", "Subscribe",
+)
+
+# Returns [destination URL, index of first matching label] for every link whose
+# text contains a label (case-insensitive with collapsed whitespace like
+# :has-text()). Meta redirects are decoded and _is_valid_ad_url's host/path
+# rules applied in the page, so only plausible ad URLs cross CDP.
+_FIND_ACTION_BUTTONS_JS = """
+({labels, labelPattern, excludedHost, excludedPath}) => {
+    const excludedHostRe = new RegExp(excludedHost);
+    const excludedPathRe = new RegExp(excludedPath);
+    // One scan rejects the many links without any label; only hits pay for findIndex
+    const anyLabelRe = new RegExp(labelPattern);
+    const found = [];
+    for (const a of document.querySelectorAll('a[href]')) {
+        const text = (a.textContent || '').replace(/\\s+/g, ' ').toLowerCase();
+        if (!anyLabelRe.test(text)) continue;
+        const index = labels.findIndex(label => text.includes(label));
+        
+        let href = a.getAttribute('href');
+        let url;
+        try {
+            url = new URL(href);
+        } catch (e) {
+            continue;  // Relative links stay on Meta
+        }
+        if (url.hostname === 'l.facebook.com' || url.hostname === 'l.instagram.com') {
+            href = url.searchParams.get('u') || url.searchParams.get('url');
+            try {
+                url = new URL(href);
+            } catch (e) {
+                continue;
+            }
+        }
+        if (!href.startsWith('http') || !url.hostname.includes('.')) continue;
+        if (excludedHostRe.test(url.hostname)) continue;
+        if (excludedPathRe.test(url.pathname.toLowerCase())) continue;
+        found.push([href, index]);
+    }
+    return found;
+}
+"""
+
 
 
 class MetaAdsLibraryScraper:
@@ -24,18 +144,35 @@ class MetaAdsLibraryScraper:
     
     BASE_URL = "https://www.facebook.com/ads/library/"
     
-    def __init__(self, config: Config, stop_check: callable = None):
+    # Replace the browser context after this many tabs to cap its memory
+    PAGES_PER_CONTEXT = 50
+    
+    # Per-keyword results from recent runs
+    CACHE_DIR = Path("data/cache/meta_ads")
+    
+    def __init__(self, config: Config, stop_check: callable = None,
+                 stop_event: Optional[asyncio.Event] = None):
         """
         Initialize Meta Ads Library scraper.
         
         Args:
             config: Application configuration
             stop_check: Optional callable that returns True if stop requested
+            stop_event: Optional event set when stop is requested; lets
+                delays end as soon as a stop arrives
         """
         self.config = config
         self.meta_config = config.sources.meta_ads_library
         self.browser: Optional[Browser] = None
-        self.page: Optional[Page] = None
+        self._context: Optional[BrowserContext] = None
+        self._pages_in_context = 0
+        # Canonical destination URLs already emitted during the current scrape_ads run
+        self._seen_urls: set = set()
+        # Canonical URLs already in training.csv, loaded on the first save
+        self._saved_urls: Optional[set] = None
+        self._stop_event = stop_event
+        if stop_check is None and stop_event is not None:
+            stop_check = stop_event.is_set
         self._stop_check = stop_check or (lambda: False)
         self._playwright = None
     
@@ -43,6 +180,11 @@ class MetaAdsLibraryScraper:
         """Initialize browser for scraping."""
         logger.info("Initializing Meta Ads Library scraper...")
         
+        await self._launch_browser()
+        logger.success("✅ Meta Ads Library scraper initialized")
+    
+    async def _launch_browser(self):
+        """Start Playwright, launch Chromium and open the scraping context."""
         # Ensure browsers are installed (especially for PyInstaller builds)
         if not ensure_browsers_installed():
             raise RuntimeError(
@@ -51,20 +193,67 @@ class MetaAdsLibraryScraper:
         
         self._playwright = await async_playwright().start()
         self.browser = await self._playwright.chromium.launch(
-            headless=self.config.automation.headless
+            headless=self.config.automation.headless,
+            args=[
+                "--disable-blink-features=AutomationControlled",
+                "--disable-dev-shm-usage",
+                "--disable-gpu",
+                "--disable-background-networking",
+                "--disable-sync",
+            ]
         )
         
+        self._context = await self._new_context()
+    
+    async def __aenter__(self):
+        """Async context manager entry: launch the browser."""
+        try:
+            await self.initialize()
+        except BaseException:
+            await self.close()
+            raise
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit: close the browser."""
+        await self.close()
+    
+    async def _new_context(self) -> BrowserContext:
+        """Create a browser context that scraping tabs are opened in."""
         context = await self.browser.new_context(
             viewport={"width": 1920, "height": 1080},
             user_agent=(
                 "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
                 "AppleWebKit/537.36 (KHTML, like Gecko) "
                 "Chrome/120.0.0.0 Safari/537.36"
-            )
+            ),
+            # Service workers would serve requests that page.route never sees
+            service_workers="block"
         )
+        await context.route("**/*", _block_unneeded_requests)
+        return context
+    
+    async def _new_page(self) -> Page:
+        """
+        Open a scraping tab, rotating to a fresh context every PAGES_PER_CONTEXT tabs.
         
-        self.page = await context.new_page()
-        logger.success("✅ Meta Ads Library scraper initialized")
+        Returns:
+            New page; release it with _close_page
+        """
+        if self._pages_in_context >= self.PAGES_PER_CONTEXT:
+            # Tabs still open keep the old context alive until _close_page retires it
+            self._context = await self._new_context()
+            self._pages_in_context = 0
+        
+        self._pages_in_context += 1
+        return await self._context.new_page()
+    
+    async def _close_page(self, page: Page):
+        """Close a scraping tab and its context once that context has been rotated out."""
+        context = page.context
+        await page.close()
+        if context is not self._context and not context.pages:
+            await context.close()
     
     async def scrape_ads(self, keywords: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
@@ -81,28 +270,50 @@ class MetaAdsLibraryScraper:
             return []
         
         keywords = keywords or self.meta_config.search_keywords
-        all_ads = []
-        
-        for keyword in keywords:
-            # Check if stop requested
-            if self._stop_check():
-                logger.info("Stop requested - aborting Meta Ads scraping")
-                break
+        self._seen_urls = set()
+        # Keywords are I/O-bound page loads, so scrape a few at once, each in its own tab
+        semaphore = asyncio.Semaphore(max(1, self.meta_config.max_concurrency))
+        
+        async def scrape_bounded(keyword: str) -> List[Dict[str, Any]]:
+            # The cache holds each keyword's own results; cross-keyword
+            # dedup is applied on the way out so it never shrinks an entry
+            cached = self._read_keyword_cache(keyword)
+            if cached is not None:
+                logger.info(f"Using cached results for keyword: {keyword}")
+                return self._claim_unseen(cached)
+            
+            async with semaphore:
+                # Jittered start keeps parallel searches from hitting Meta in lockstep
+                if self._stop_check() or await wait_or_stop(random.uniform(0.5, 3), self._stop_event):
+                    return []
                 
-            logger.info(f"Scraping ads for keyword: {keyword}")
-            ads = await self._scrape_keyword(keyword)
-            all_ads.extend(ads)
-            
-            # Check stop before delay
-            if self._stop_check():
-                logger.info("Stop requested - aborting Meta Ads scraping")
-                break
-            
-            # Add delay between keyword searches
-            await asyncio.sleep(3)
+                logger.info(f"Scraping ads for keyword: {keyword}")
+                page = await self._new_page()
+                try:
+                    ads = await self._scrape_keyword(keyword, page)
+                finally:
+                    await self._close_page(page)
+            
+            # Empty or interrupted results aren't worth pinning for a whole TTL
+            if ads and not self._stop_check():
+                self._write_keyword_cache(keyword, ads)
+            return self._claim_unseen(ads)
+        
+        results = await asyncio.gather(
+            *(scrape_bounded(keyword) for keyword in keywords),
+            return_exceptions=True
+        )
         
-        # Remove duplicates based on destination URL
-        unique_ads = self._deduplicate_ads(all_ads)
+        # Already unique: every keyword task checks the shared _seen_urls
+        unique_ads = []
+        for keyword, result in zip(keywords, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error scraping keyword '{keyword}': {result}")
+                continue
+            unique_ads.extend(result)
+        
+        if self._stop_check():
+            logger.info("Stop requested - aborting Meta Ads scraping")
         
         # Save to training.csv (only if we got any ads)
         if unique_ads and not self._stop_check():
@@ -112,303 +323,218 @@ class MetaAdsLibraryScraper:
             logger.success(f"✅ Scraped {len(unique_ads)} unique ads from Meta Ads Library")
         return unique_ads
     
-    async def _scrape_keyword(self, keyword: str) -> List[Dict[str, Any]]:
+    def _keyword_cache_file(self, keyword: str) -> Path:
+        """Cache file for a keyword; the ad limit is part of the key."""
+        key = f"{keyword}\0{self.meta_config.ad_limit}".encode("utf-8")
+        return self.CACHE_DIR / f"{hashlib.sha1(key).hexdigest()}.json"
+    
+    def _read_keyword_cache(self, keyword: str) -> Optional[List[Dict[str, Any]]]:
         """
-        Scrape ads for a specific keyword.
+        Load a keyword's cached ads if they are younger than the configured TTL.
         
         Args:
             keyword: Search keyword
             
         Returns:
-            List of ad data
+            Cached ads, or None on a miss
         """
-        ads = []
+        ttl = self.meta_config.cache_ttl_seconds
+        if ttl <= 0:
+            return None
         
+        cache_file = self._keyword_cache_file(keyword)
         try:
-            # Build search URL
-            search_url = (
-                f"{self.BASE_URL}?active_status=active&"
-                f"ad_type=all&country=US&q={keyword.replace(' ', '+')}&"
-                f"search_type=keyword_unordered"
-            )
-            
-            logger.info(f"Loading Meta Ads Library for keyword: {keyword}")
-            logger.debug(f"URL: {search_url}")
-            
-            # Don't wait for networkidle - Meta's page is very dynamic
-            await self.page.goto(search_url, wait_until="domcontentloaded", timeout=45000)
-            
-            # Wait for ads to appear
-            logger.debug("Waiting for ads to load...")
-            await asyncio.sleep(5)
-            
-            # Look for action buttons on ads
-            try:
-                # Wait for any action button to appear
-                await self.page.wait_for_selector('a:has-text("Sign up"), a:has-text("Learn more"), a:has-text("Shop now")', timeout=10000)
-                logger.debug("Found action buttons on ads")
-            except:
-                logger.warning("No action buttons found - page may not have loaded properly")
-            
-            # Scroll to load more ads
-            await self._scroll_page(scrolls=2)
-            
-            # Extract URLs directly from action buttons
-            ads = await self._extract_urls_from_action_buttons(keyword)
-            
-            if not ads:
-                logger.warning(f"No ads extracted for keyword '{keyword}'")
-            
-        except Exception as e:
-            logger.error(f"Error scraping keyword '{keyword}': {e}")
+            if time.time() - cache_file.stat().st_mtime > ttl:
+                return None
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _write_keyword_cache(self, keyword: str, ads: List[Dict[str, Any]]):
+        """Store a keyword's freshly scraped ads for later runs."""
+        if self.meta_config.cache_ttl_seconds <= 0:
+            return
         
-        return ads
+        try:
+            self.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(self._keyword_cache_file(keyword), 'w', encoding='utf-8') as f:
+                json.dump(ads, f)
+        except OSError as e:
+            logger.debug(f"Could not cache results for '{keyword}': {e}")
     
-    async def _scroll_page(self, scrolls: int = 2):
-        """Scroll page to load more ads."""
-        for i in range(scrolls):
-            await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(3)
-            logger.debug(f"Scrolled {i+1}/{scrolls} times")
+    def _claim_unseen(self, ads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep ads whose URL no other keyword has produced yet in this run."""
+        unseen = []
+        for ad in ads:
+            url = ad.get("url")
+            if not url:
+                continue
+            key = canonical_url(url)
+            if key not in self._seen_urls:
+                self._seen_urls.add(key)
+                unseen.append(ad)
+        return unseen
     
-    async def _extract_urls_from_action_buttons(self, keyword: str) -> List[Dict[str, Any]]:
+    async def _scrape_keyword(self, keyword: str, page: Page) -> List[Dict[str, Any]]:
         """
-        Extract destination URLs from action buttons (Sign Up, Learn More, Shop Now, etc.).
+        Scrape ads for a specific keyword.
         
         Args:
             keyword: Search keyword
+            page: Tab to load the search results in
             
         Returns:
             List of ad data
+            
+        Raises:
+            playwright.async_api.Error: If the page can't be loaded; scrape_ads
+                logs it for this keyword without failing the others
         """
-        ads = []
-        seen_urls = set()
+        # Build search URL
+        search_url = (
+            f"{self.BASE_URL}?active_status=active&"
+            f"ad_type=all&country=US&q={keyword.replace(' ', '+')}&"
+            f"search_type=keyword_unordered"
+        )
         
-        try:
-            # Common action button text patterns
-            action_patterns = [
-                "Sign up", "Sign Up", "SIGN UP",
-                "Learn more", "Learn More", "LEARN MORE",
-                "Shop now", "Shop Now", "SHOP NOW",
-                "Order now", "Order Now", "ORDER NOW",
-                "Get started", "Get Started", "GET STARTED",
-                "Visit profile", "Visit Profile",
-                "Book now", "Book Now",
-                "Download", "DOWNLOAD",
-                "Apply now", "Apply Now",
-                "Get offer", "Get Offer",
-                "Join now", "Join Now",
-                "Subscribe", "SUBSCRIBE"
-            ]
-            
-            logger.info(f"Searching for action buttons on ad cards...")
-            
-            # Find all links that match action patterns
-            for pattern in action_patterns:
-                try:
-                    buttons = await self.page.query_selector_all(f'a:has-text("{pattern}")')
-                    logger.debug(f"Found {len(buttons)} '{pattern}' buttons")
-                    
-                    for button in buttons:
-                        try:
-                            href = await button.get_attribute("href")
-                            if not href:
-                                continue
-                            
-                            # Extract actual URL if it's a Facebook redirect
-                            if "l.facebook.com" in href or "l.instagram.com" in href:
-                                actual_url = self._extract_url_from_redirect(href)
-                                if actual_url:
-                                    href = actual_url
-                            
-                            # Validate and deduplicate
-                            if href and self._is_valid_ad_url(href) and href not in seen_urls:
-                                seen_urls.add(href)
-                                ad_data = {
-                                    "url": href,
-                                    "title": f"{keyword} - {pattern}",
-                                    "description": "",
-                                    "keyword": keyword,
-                                    "source": "meta",
-                                    "scraped_at": datetime.utcnow().isoformat()
-                                }
-                                ads.append(ad_data)
-                                logger.success(f"✅ Found ad URL: {href}")
-                                
-                                # Stop if we have enough
-                                if len(ads) >= self.meta_config.ad_limit:
-                                    return ads
-                                    
-                        except Exception as e:
-                            logger.debug(f"Error extracting from button: {e}")
-                            continue
-                            
-                except Exception as e:
-                    logger.debug(f"Error finding '{pattern}' buttons: {e}")
-                    continue
-            
-            logger.info(f"Extracted {len(ads)} unique ad URLs from action buttons")
-            
-        except Exception as e:
-            logger.error(f"Error extracting URLs from action buttons: {e}")
+        logger.info(f"Loading Meta Ads Library for keyword: {keyword}")
+        logger.debug(f"URL: {search_url}")
         
-        return ads
-    
-    
-    async def _extract_ads_from_page(self, keyword: str) -> List[Dict[str, Any]]:
-        """
-        Extract ad information from the current page.
+        await self._goto_with_retry(page, search_url)
+        if self._stop_check():
+            return []
         
-        Args:
-            keyword: Search keyword used
-            
-        Returns:
-            List of ad data dictionaries
-        """
-        ads = []
+        # Wait for ads to appear
+        logger.debug("Waiting for ads to load...")
         
+        # Look for action buttons on ads
         try:
-            # Wait for ad cards to load
-            await asyncio.sleep(3)
-            
-            # Try multiple strategies to find ad destination URLs
-            
-            # Strategy 1: Look for "See Ad" or "Go to website" buttons/links
-            see_ad_buttons = await self.page.query_selector_all('a[href*="l.facebook.com"], a[href*="l.instagram.com"]')
-            logger.debug(f"Found {len(see_ad_buttons)} potential ad redirect links")
-            
-            for button in see_ad_buttons[:self.meta_config.ad_limit]:
-                try:
-                    href = await button.get_attribute("href")
-                    if href and ("l.facebook.com" in href or "l.instagram.com" in href):
-                        # Extract the actual destination URL from Facebook's redirect
-                        actual_url = self._extract_url_from_redirect(href)
-                        if actual_url and self._is_valid_ad_url(actual_url):
-                            ad_data = {
-                                "url": actual_url,
-                                "title": keyword,
-                                "description": "",
-                                "keyword": keyword,
-                                "source": "meta",
-                                "scraped_at": datetime.utcnow().isoformat()
-                            }
-                            ads.append(ad_data)
-                            logger.debug(f"Found ad URL: {actual_url}")
-                except Exception as e:
-                    logger.debug(f"Error extracting from button: {e}")
-            
-            # Strategy 2: Look for external links in ad content
-            if len(ads) < 5:
-                external_links = await self.page.query_selector_all('a[href^="http"]')
-                for link in external_links:
-                    try:
-                        href = await link.get_attribute("href")
-                        if href and self._is_valid_ad_url(href) and not any(ad["url"] == href for ad in ads):
-                            # Check if this link is near ad content
-                            text = await link.text_content() or ""
-                            if any(word in text.lower() for word in ["learn", "shop", "sign up", "get", "join", "visit"]):
-                                ad_data = {
-                                    "url": href,
-                                    "title": text[:200] if text else keyword,
-                                    "description": "",
-                                    "keyword": keyword,
-                                    "source": "meta",
-                                    "scraped_at": datetime.utcnow().isoformat()
-                                }
-                                ads.append(ad_data)
-                                logger.debug(f"Found external ad URL: {href}")
-                                
-                                if len(ads) >= self.meta_config.ad_limit:
-                                    break
-                    except Exception as e:
-                        logger.debug(f"Error extracting external link: {e}")
-            
-        except Exception as e:
-            logger.error(f"Error extracting ads from page: {e}")
+            # Wait for any action button to appear (returns as soon as one renders)
+            await page.wait_for_selector('a:has-text("Sign up"), a:has-text("Learn more"), a:has-text("Shop now")', timeout=15000)
+            logger.debug("Found action buttons on ads")
+        except:
+            logger.warning("No action buttons found - page may not have loaded properly")
+        
+        # Scroll to load more ads
+        await self._scroll_page(page, scrolls=2)
         
-        return ads[:self.meta_config.ad_limit]
+        # Extract URLs directly from action buttons
+        ads = await self._extract_urls_from_action_buttons(keyword, page)
+        
+        if not ads:
+            logger.warning(f"No ads extracted for keyword '{keyword}'")
+        
+        return ads
     
-    def _extract_url_from_redirect(self, redirect_url: str) -> Optional[str]:
+    async def _goto_with_retry(self, page: Page, url: str, tries: int = 3) -> Optional[Response]:
         """
-        Extract actual destination URL from Facebook's redirect URL.
+        Navigate to a URL, retrying transient failures with exponential backoff.
+        
+        Timeouts and network errors (net::ERR_*) are retried after ~1s, 2s, ...;
+        throttling responses (429/503) wait longer. Any other error propagates.
         
         Args:
-            redirect_url: Facebook redirect URL (l.facebook.com or l.instagram.com)
+            page: Tab to navigate
+            url: URL to load
+            tries: Total attempts
             
         Returns:
-            Actual destination URL or None
+            Final navigation response, or None if a stop was requested while waiting
         """
-        try:
-            from urllib.parse import urlparse, parse_qs
-            
-            # Parse the redirect URL
-            parsed = urlparse(redirect_url)
-            
-            # Look for 'u' parameter (common in Facebook redirects)
-            if parsed.query:
-                params = parse_qs(parsed.query)
-                if 'u' in params:
-                    return params['u'][0]
-                # Sometimes it's in 'url' parameter
-                if 'url' in params:
-                    return params['url'][0]
-            
-            return None
-        except Exception as e:
-            logger.debug(f"Error extracting URL from redirect: {e}")
-            return None
+        for attempt in range(tries):
+            last_attempt = attempt == tries - 1
+            try:
+                # Don't wait for networkidle - Meta's page is very dynamic
+                response = await page.goto(url, wait_until="domcontentloaded", timeout=45000)
+            except PlaywrightError as e:
+                transient = isinstance(e, PlaywrightTimeoutError) or "net::ERR_" in str(e)
+                if last_attempt or not transient:
+                    raise
+                delay = 2 ** attempt + random.random()
+                logger.warning(f"Navigation failed ({e}); retrying in {delay:.1f}s")
+            else:
+                if last_attempt or response is None or response.status not in _THROTTLED_STATUSES:
+                    return response
+                delay = 5 * 2 ** attempt + random.random()
+                logger.warning(f"Meta returned HTTP {response.status}; backing off {delay:.1f}s")
+            
+            if await wait_or_stop(delay, self._stop_event):
+                return None
     
-    async def _click_ads_and_extract_urls(self, keyword: str) -> List[Dict[str, Any]]:
+    async def _scroll_page(self, page: Page, scrolls: int = 2):
+        """Scroll page to load more ads."""
+        for i in range(scrolls):
+            height = await page.evaluate(_SCROLL_TO_BOTTOM_JS)
+            try:
+                # Continue as soon as more ads extend the page, rather than always sleeping
+                await page.wait_for_function(
+                    "height => document.body.scrollHeight > height", arg=height, timeout=3000
+                )
+            except Exception:
+                pass  # Nothing more loaded within the old fixed delay
+            logger.debug(f"Scrolled {i+1}/{scrolls} times")
+    
+    async def _extract_urls_from_action_buttons(self, keyword: str, page: Page) -> List[Dict[str, Any]]:
         """
-        Click on ads to reveal destination URLs.
+        Extract destination URLs from action buttons (Sign Up, Learn More, Shop Now, etc.).
         
         Args:
             keyword: Search keyword
+            page: Tab showing the search results
             
         Returns:
             List of ad data
         """
         ads = []
+        # One timestamp per page; the ads on it are scraped within milliseconds
+        scraped_at = datetime.utcnow().isoformat()
+        # Only this keyword's duplicates; scrape_ads dedups across keywords
+        seen_urls = set()
         
         try:
-            # Try to find and click "See more" or expand buttons
-            expand_buttons = await self.page.query_selector_all('[aria-label*="See more"], [aria-label*="Show more"]')
+            logger.info(f"Searching for action buttons on ad cards...")
             
-            for i, button in enumerate(expand_buttons[:5]):  # Limit to first 5 ads
-                try:
-                    # Click to expand ad content
-                    await button.click()
-                    await asyncio.sleep(1)
-                    
-                    # Look for external links after expansion
-                    parent = await button.query_selector('xpath=ancestor::div[contains(@class, "x1yztbdb")]')
-                    if parent:
-                        links = await parent.query_selector_all('a[href^="http"]')
-                        for link in links:
-                            href = await link.get_attribute("href")
-                            if href and self._is_valid_ad_url(href):
-                                actual_url = self._extract_url_from_redirect(href) if "l.facebook" in href else href
-                                if actual_url:
-                                    ad_data = {
-                                        "url": actual_url,
-                                        "title": keyword,
-                                        "description": "",
-                                        "keyword": keyword,
-                                        "source": "meta",
-                                        "scraped_at": datetime.utcnow().isoformat()
-                                    }
-                                    ads.append(ad_data)
-                                    logger.debug(f"Extracted URL from expanded ad: {actual_url}")
-                                    break
-                except Exception as e:
-                    logger.debug(f"Error clicking ad {i}: {e}")
+            # One round trip for every matching link instead of one query per label
+            labels = [label.lower() for label in _ACTION_LABELS]
+            buttons = await page.evaluate(_FIND_ACTION_BUTTONS_JS, {
+                "labels": labels,
+                "labelPattern": "|".join(map(re.escape, labels)),
+                "excludedHost": _EXCLUDED_HOST_RE.pattern,
+                "excludedPath": _EXCLUDED_PATH_RE.pattern,
+            })
+            logger.debug(f"Found {len(buttons)} action buttons")
+            
+            # Same order as querying label by label: by label first, then DOM order
+            buttons.sort(key=lambda button: button[1])
+            
+            for href, label_index in buttons:
+                # The page already filtered; this only catches JS/Python regex drift.
+                # Then deduplicate tracking-parameter variants of the same page
+                if not self._is_valid_ad_url(href):
                     continue
-                
-                if len(ads) >= self.meta_config.ad_limit:
-                    break
+                key = canonical_url(href)
+                if key not in seen_urls:
+                    seen_urls.add(key)
+                    ad_data = {
+                        "url": href,
+                        "title": f"{keyword} - {_ACTION_LABELS[label_index]}",
+                        "description": "",
+                        "keyword": keyword,
+                        "source": "meta",
+                        "scraped_at": scraped_at
+                    }
+                    ads.append(ad_data)
+                    logger.success(f"✅ Found ad URL: {href}")
                     
+                    # Stop if we have enough
+                    if len(ads) >= self.meta_config.ad_limit:
+                        return ads
+            
+            logger.info(f"Extracted {len(ads)} unique ad URLs from action buttons")
+            
         except Exception as e:
-            logger.debug(f"Error in click and extract: {e}")
+            logger.error(f"Error extracting URLs from action buttons: {e}")
         
         return ads
     
@@ -425,99 +551,104 @@ class MetaAdsLibraryScraper:
         if not url or not url.startswith("http"):
             return False
         
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            return False
+        host = parts.hostname or ""
+        
+        # Must have a valid domain structure
+        if "." not in host:
+            return False
+        
         # Exclude Facebook/Meta internal URLs and common non-ad links
-        exclude_domains = [
-            "facebook.com",
-            "fb.com", 
-            "instagram.com",
-            "messenger.com",
-            "meta.com",
-            "fbcdn.net",
-            "youtube.com",
-            "youtu.be",
-            "twitter.com",
-            "linkedin.com",
-            "tiktok.com"
-        ]
+        if _EXCLUDED_HOST_RE.search(host):
+            return False
         
         # Exclude specific paths that are never ads
-        exclude_paths = [
-            "/terms",
-            "/privacy",
-            "/help",
-            "/about",
-            "/legal",
-            "/support",
-            "/ads-transparency"
-        ]
-        
-        url_lower = url.lower()
-        
-        # Check excluded domains
-        for domain in exclude_domains:
-            if domain in url_lower:
-                return False
-        
-        # Check excluded paths
-        for path in exclude_paths:
-            if path in url_lower:
-                return False
-        
-        # Must have a valid domain structure
-        if url.count('.') < 1:
+        if _EXCLUDED_PATH_RE.search(parts.path.lower()):
             return False
         
         return True
     
-    def _deduplicate_ads(self, ads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """
-        Remove duplicate ads based on URL.
-        
-        Args:
-            ads: List of ad data
-            
-        Returns:
-            List of unique ads
-        """
-        seen_urls = set()
-        unique_ads = []
-        
-        for ad in ads:
-            url = ad.get("url", "")
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique_ads.append(ad)
-        
-        return unique_ads
+    @staticmethod
+    def _read_saved_urls(csv_path: Path) -> set:
+        """Collect the canonical URLs of an existing training.csv."""
+        urls = set()
+        try:
+            with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                if 'url' not in header:
+                    return urls
+                url_i = header.index('url')
+                for row in reader:
+                    if len(row) > url_i:
+                        urls.add(canonical_url(row[url_i]))
+        except FileNotFoundError:
+            pass
+        return urls
     
     def _save_to_csv(self, ads: List[Dict[str, Any]]):
-        """Save scraped ads to training.csv"""
+        """Save scraped ads to training.csv, skipping URLs it already holds"""
         try:
             csv_path = Path("data/training.csv")
             
             # Check if file exists and has data
             file_exists = csv_path.exists() and csv_path.stat().st_size > 0
             
-            with open(csv_path, 'a', newline='', encoding='utf-8') as f:
-                fieldnames = ['url', 'title', 'description', 'keyword', 'source', 'scraped_at']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                
-                # Write header only if file is new/empty
-                if not file_exists:
-                    writer.writeheader()
-                
-                # Write ads
-                for ad in ads:
-                    writer.writerow({
-                        'url': ad.get('url', ''),
-                        'title': ad.get('title', ''),
-                        'description': ad.get('description', ''),
-                        'keyword': ad.get('keyword', ''),
-                        'source': ad.get('source', 'meta'),
-                        'scraped_at': ad.get('scraped_at', datetime.utcnow().isoformat())
-                    })
+            if self._saved_urls is None:
+                self._saved_urls = self._read_saved_urls(csv_path) if file_exists else set()
+            saved_urls = self._saved_urls
             
-            logger.success(f"✅ Saved {len(ads)} ads to training.csv")
+            scraped_at = datetime.utcnow().isoformat()
+            rows = []
+            for ad in ads:
+                url = ad.get('url', '')
+                key = canonical_url(url)
+                if key in saved_urls:
+                    continue
+                saved_urls.add(key)
+                rows.append((
+                    url,
+                    ad.get('title', ''),
+                    ad.get('description', ''),
+                    ad.get('keyword', ''),
+                    ad.get('source', 'meta'),
+                    ad.get('scraped_at') or scraped_at
+                ))
+            
+            if not rows:
+                logger.info("All scraped ads are already in training.csv")
+                return
+            
+            # Format the whole batch first so the file only ever gains complete rows
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            
+            # Write header only if file is new/empty
+            if not file_exists:
+                writer.writerow(CSV_COLUMNS)
+            
+            # Write ads
+            writer.writerows(rows)
+            payload = buffer.getvalue().encode('utf-8')
+            
+            csv_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(
+                csv_path,
+                os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0),
+                0o644
+            )
+            try:
+                # One append; a stop or kill can't leave half a batch behind
+                written = os.write(fd, payload)
+                while written < len(payload):
+                    written += os.write(fd, payload[written:])
+            finally:
+                os.close(fd)
+            
+            logger.success(f"✅ Saved {len(rows)} new ads to training.csv")
         except Exception as e:
             logger.error(f"Failed to save ads to CSV: {e}")
     
@@ -525,49 +656,13 @@ class MetaAdsLibraryScraper:
         """Close browser and clean up."""
         try:
             if self.browser:
+                # Closing the browser also closes every context and tab
                 await self.browser.close()
                 self.browser = None
+                self._context = None
             if self._playwright:
                 await self._playwright.stop()
                 self._playwright = None
             logger.info("Meta Ads Library scraper closed")
         except Exception as e:
             logger.error(f"Error closing scraper: {e}")
-
-
-class MetaAdsAPIClient:
-    """
-    Alternative implementation using Meta Graph API.
-    Requires proper API access token and permissions.
-    """
-    
-    BASE_API_URL = "https://graph.facebook.com/v18.0"
-    
-    def __init__(self, access_token: str):
-        """
-        Initialize Meta API client.
-        
-        Args:
-            access_token: Meta API access token
-        """
-        self.access_token = access_token
-        logger.info("Meta Ads API client initialized")
-    
-    async def search_ads(self, keywords: List[str]) -> List[Dict[str, Any]]:
-        """
-        Search for ads using Meta Graph API.
-        
-        Note: This requires proper API setup and permissions.
-        The Ad Library API has specific requirements and rate limits.
-        
-        Args:
-            keywords: Search keywords
-            
-        Returns:
-            List of ad data
-        """
-        # Placeholder for API implementation
-        logger.warning("Meta Graph API implementation requires proper setup")
-        logger.info("Using browser scraping method instead")
-        return []
-
@@ -3,9 +3,9 @@ System tray application for InboxHunter Agent.
 Provides minimal UI through system tray icon and menu.
 """
 
-import asyncio
 import threading
 import webbrowser
+from functools import lru_cache
 from typing import Optional, Callable
 from pathlib import Path
 from loguru import logger
@@ -19,6 +19,41 @@ except ImportError:
     logger.warning("pystray or PIL not installed, system tray not available")
 
 
+# Fill colors (RGBA) of the generated status icons
+_STATUS_COLORS = {
+    "idle": (128, 128, 128, 255),      # Gray
+    "connected": (0, 200, 100, 255),    # Green
+    "running": (0, 150, 255, 255),      # Blue
+    "error": (255, 100, 100, 255),      # Red
+    "offline": (200, 100, 0, 255)       # Orange
+}
+
+# Generated icons are 64x64 circles inset by this much
+_ICON_SIZE = 64
+_ICON_PADDING = 4
+
+
+@lru_cache(maxsize=None)
+def _icon_template() -> tuple:
+    """
+    Draw the generated icon's shape once for all status colors.
+    
+    Returns:
+        (fill_mask, outline): an L mask of the circle's interior and an
+        RGBA image holding only the white ring on a transparent background
+    """
+    from PIL import ImageDraw
+    box = [_ICON_PADDING, _ICON_PADDING, _ICON_SIZE - _ICON_PADDING, _ICON_SIZE - _ICON_PADDING]
+    
+    fill_mask = Image.new('L', (_ICON_SIZE, _ICON_SIZE), 0)
+    ImageDraw.Draw(fill_mask).ellipse(box, fill=255, outline=0, width=2)
+    
+    outline = Image.new('RGBA', (_ICON_SIZE, _ICON_SIZE), (0, 0, 0, 0))
+    ImageDraw.Draw(outline).ellipse(box, outline=(255, 255, 255, 200), width=2)
+    
+    return fill_mask, outline
+
+
 class SystemTrayApp:
     """
     System tray application for the InboxHunter Agent.
@@ -34,6 +69,9 @@ class SystemTrayApp:
     # Dashboard URL
     DASHBOARD_URL = "https://app.inboxhunter.io"
     
+    # Delay before a menu refresh; updates arriving meanwhile share it
+    MENU_REFRESH_INTERVAL = 1.0
+    
     def __init__(
         self,
         on_start: Optional[Callable[[], None]] = None,
@@ -56,36 +94,39 @@ class SystemTrayApp:
         self._status = "idle"
         self._stats = {"successful": 0, "failed": 0}
         
-        # Load icons
+        # Pending one-shot menu refresh, if the labels are stale
+        self._refresh_timer: Optional[threading.Timer] = None
+        self._refresh_lock = threading.Lock()
+        
+        # Status icons, loaded or generated on first use
         self._icons = {}
-        self._load_icons()
+        # Status whose icon and tooltip the tray currently shows
+        self._shown_status: Optional[str] = None
     
-    def _load_icons(self):
-        """Load status icons for tray."""
-        if not PYSTRAY_AVAILABLE:
-            return
+    def _get_icon(self, status: str) -> Image.Image:
+        """
+        Get the tray icon for a status, loading it on first request.
         
-        # Icon paths
-        resources_dir = Path(__file__).parent.parent.parent / "resources"
+        Args:
+            status: Status to show
+            
+        Returns:
+            PIL Image
+        """
+        icon = self._icons.get(status)
+        if icon is not None:
+            return icon
         
-        # Try to load custom icons, fall back to generated ones
-        icon_files = {
-            "idle": resources_dir / "icon_idle.png",
-            "connected": resources_dir / "icon_connected.png",
-            "running": resources_dir / "icon_running.png",
-            "error": resources_dir / "icon_error.png"
-        }
+        # Try to load a custom icon, fall back to a generated one
+        icon_path = Path(__file__).parent.parent.parent / "resources" / f"icon_{status}.png"
+        try:
+            icon = Image.open(icon_path)
+            icon.load()  # Decode now rather than on the tray's first draw
+        except Exception:
+            icon = self._generate_icon(status)
         
-        for status, icon_path in icon_files.items():
-            if icon_path.exists():
-                try:
-                    self._icons[status] = Image.open(icon_path)
-                    continue
-                except Exception:
-                    pass
-            
-            # Generate simple colored icon
-            self._icons[status] = self._generate_icon(status)
+        self._icons[status] = icon
+        return icon
     
     def _generate_icon(self, status: str) -> Image.Image:
         """
@@ -97,43 +138,29 @@ class SystemTrayApp:
         Returns:
             PIL Image
         """
-        colors = {
-            "idle": (128, 128, 128),      # Gray
-            "connected": (0, 200, 100),    # Green
-            "running": (0, 150, 255),      # Blue
-            "error": (255, 100, 100),      # Red
-            "offline": (200, 100, 0)       # Orange
-        }
-        
-        color = colors.get(status, colors["idle"])
-        
-        # Create 64x64 icon
-        size = 64
-        image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        color = _STATUS_COLORS.get(status, _STATUS_COLORS["idle"])
         
-        # Draw a filled circle
-        from PIL import ImageDraw
-        draw = ImageDraw.Draw(image)
-        padding = 4
-        draw.ellipse(
-            [padding, padding, size - padding, size - padding],
-            fill=color + (255,),
-            outline=(255, 255, 255, 200),
-            width=2
-        )
+        # Color the circle's interior; the ring and background come from the template
+        fill_mask, outline = _icon_template()
+        image = Image.composite(Image.new('RGBA', fill_mask.size, color), outline, fill_mask)
         
         return image
     
     def _create_menu(self) -> pystray.Menu:
-        """Create the tray menu."""
+        """
+        Create the tray menu.
+        
+        Built once: labels and visibility are callables that pystray
+        re-evaluates on update_menu(), so state changes don't rebuild it.
+        """
         return pystray.Menu(
             pystray.MenuItem(
-                f"Status: {self._status.title()}",
+                lambda item: f"Status: {self._status.title()}",
                 None,
                 enabled=False
             ),
             pystray.MenuItem(
-                f"✅ {self._stats['successful']} | ❌ {self._stats['failed']}",
+                lambda item: f"✅ {self._stats['successful']} | ❌ {self._stats['failed']}",
                 None,
                 enabled=False
             ),
@@ -146,12 +173,12 @@ class SystemTrayApp:
             pystray.MenuItem(
                 "▶ Start",
                 self._handle_start,
-                visible=self._status in ["idle", "connected", "error"]
+                visible=lambda item: self._status in ("idle", "connected", "error")
             ),
             pystray.MenuItem(
                 "⏹ Stop",
                 self._handle_stop,
-                visible=self._status == "running"
+                visible=lambda item: self._status == "running"
             ),
             pystray.Menu.SEPARATOR,
             pystray.MenuItem(
@@ -169,13 +196,18 @@ class SystemTrayApp:
             )
         )
     
+    @staticmethod
+    def _open_url(url: str):
+        """Open a URL without blocking the tray while a browser cold-starts."""
+        threading.Thread(target=webbrowser.open, args=(url,), daemon=True).start()
+    
     def _open_dashboard(self, icon=None, item=None):
         """Open dashboard in browser."""
-        webbrowser.open(self.DASHBOARD_URL)
+        self._open_url(self.DASHBOARD_URL)
     
     def _open_settings(self, icon=None, item=None):
         """Open settings page in browser."""
-        webbrowser.open(f"{self.DASHBOARD_URL}/settings")
+        self._open_url(f"{self.DASHBOARD_URL}/settings")
     
     def _open_logs(self, icon=None, item=None):
         """Open logs directory."""
@@ -186,12 +218,13 @@ class SystemTrayApp:
         logs_dir = get_data_dir() / "logs"
         logs_dir.mkdir(exist_ok=True)
         
+        # Popen returns immediately; the tray doesn't wait for the file manager
         if sys.platform == "win32":
-            subprocess.run(["explorer", str(logs_dir)])
+            subprocess.Popen(["explorer", str(logs_dir)])
         elif sys.platform == "darwin":
-            subprocess.run(["open", str(logs_dir)])
+            subprocess.Popen(["open", str(logs_dir)])
         else:
-            subprocess.run(["xdg-open", str(logs_dir)])
+            subprocess.Popen(["xdg-open", str(logs_dir)])
     
     def _handle_start(self, icon=None, item=None):
         """Handle Start menu click."""
@@ -214,25 +247,49 @@ class SystemTrayApp:
         if self.on_quit:
             self.on_quit()
     
-    def update_status(self, status: str):
+    def update(self, *, status: Optional[str] = None, stats: Optional[dict] = None):
         """
-        Update tray icon status.
+        Update status and/or statistics together, marking the menu stale once.
         
         Args:
             status: New status (idle, connected, running, error)
+            stats: Dictionary with successful and failed counts
         """
-        self._status = status
+        changed = False
         
-        if self._icon:
+        if status is not None and status != self._status:
+            self._status = status
+            changed = True
+        
+        if stats is not None:
+            new_stats = {
+                "successful": stats.get("successful", 0),
+                "failed": stats.get("failed", 0)
+            }
+            if new_stats != self._stats:
+                self._stats = new_stats
+                changed = True
+        
+        if changed:
+            self._schedule_menu_refresh()
+        
+        # Reassigning an unchanged icon still makes the OS redraw (and on Linux re-export) it
+        if self._icon and self._status != self._shown_status:
             # Update icon
-            if status in self._icons:
-                self._icon.icon = self._icons[status]
-            
-            # Update menu
-            self._icon.menu = self._create_menu()
+            self._icon.icon = self._get_icon(self._status)
             
             # Update tooltip
-            self._icon.title = f"InboxHunter Agent - {status.title()}"
+            self._icon.title = f"InboxHunter Agent - {self._status.title()}"
+            self._shown_status = self._status
+    
+    def update_status(self, status: str):
+        """
+        Update tray icon status.
+        
+        Args:
+            status: New status (idle, connected, running, error)
+        """
+        self.update(status=status)
     
     def update_stats(self, stats: dict):
         """
@@ -241,13 +298,33 @@ class SystemTrayApp:
         Args:
             stats: Dictionary with successful and failed counts
         """
-        self._stats = {
-            "successful": stats.get("successful", 0),
-            "failed": stats.get("failed", 0)
-        }
-        
+        self.update(stats=stats)
+    
+    def _schedule_menu_refresh(self):
+        """Refresh the menu after MENU_REFRESH_INTERVAL unless a refresh is already pending."""
+        with self._refresh_lock:
+            if self._refresh_timer is not None:
+                return
+            self._refresh_timer = threading.Timer(self.MENU_REFRESH_INTERVAL, self._refresh_menu)
+            self._refresh_timer.daemon = True
+            self._refresh_timer.start()
+    
+    def _refresh_menu(self):
+        """Re-evaluate the menu's dynamic labels (runs on the refresh timer)."""
+        with self._refresh_lock:
+            self._refresh_timer = None
         if self._icon:
-            self._icon.menu = self._create_menu()
+            try:
+                self._icon.update_menu()
+            except Exception as e:
+                logger.debug(f"Menu refresh error: {e}")
+    
+    def _cancel_menu_refresh(self):
+        """Drop a pending menu refresh."""
+        with self._refresh_lock:
+            if self._refresh_timer is not None:
+                self._refresh_timer.cancel()
+                self._refresh_timer = None
     
     def show_notification(self, title: str, message: str):
         """
@@ -272,15 +349,19 @@ class SystemTrayApp:
         # Create icon
         self._icon = pystray.Icon(
             name="InboxHunter",
-            icon=self._icons.get("idle", self._generate_icon("idle")),
+            icon=self._get_icon("idle"),
             title="InboxHunter Agent - Idle",
             menu=self._create_menu()
         )
+        self._shown_status = "idle"
         
         logger.info("Starting system tray...")
         
         # Run (blocking)
-        self._icon.run()
+        try:
+            self._icon.run()
+        finally:
+            self._cancel_menu_refresh()
     
     def run_detached(self):
         """Run system tray in background thread."""
@@ -316,6 +397,12 @@ class ConsoleFallback:
         self._running = True
         self._status = "idle"
     
+    def update(self, *, status: Optional[str] = None, stats: Optional[dict] = None):
+        if status is not None:
+            self.update_status(status)
+        if stats is not None:
+            self.update_stats(stats)
+    
     def update_status(self, status: str):
         self._status = status
         print(f"\r[Status: {status}] ", end="", flush=True)
@@ -2,10 +2,24 @@
 Helper functions for the bot.
 """
 
+import asyncio
 import random
 import time
 import math
-from typing import Tuple, List
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Tuple, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Naive UTC epoch, matching datetime.utcnow()
+_EPOCH = datetime(1970, 1, 1)
+
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Query parameters that only track the click, never change the landing page
+_TRACKING_PARAM_PREFIXES = ("utm_", "mc_")
+_TRACKING_PARAMS = frozenset({"ref", "ref_src", "fbclid", "gclid", "gclsrc"})
 
 
 def random_delay(min_seconds: float, max_seconds: float) -> float:
@@ -24,6 +38,75 @@ def random_delay(min_seconds: float, max_seconds: float) -> float:
     return delay
 
 
+async def wait_or_stop(seconds: float, stop_event: Optional[asyncio.Event] = None) -> bool:
+    """
+    Sleep for up to `seconds`, waking early if the stop event is set.
+    
+    Args:
+        seconds: Maximum time to wait
+        stop_event: Optional event signalling a stop request
+        
+    Returns:
+        True if the wait ended because a stop was requested
+    """
+    if stop_event is None:
+        await asyncio.sleep(seconds)
+        return False
+    try:
+        await asyncio.wait_for(stop_event.wait(), timeout=seconds)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+def iso_from_ns(timestamp_ns: int) -> str:
+    """
+    Format a time.time_ns() value like datetime.utcnow().isoformat().
+    
+    Args:
+        timestamp_ns: Nanoseconds since the epoch
+        
+    Returns:
+        Naive UTC ISO timestamp with microsecond precision
+    """
+    return (_EPOCH + timedelta(microseconds=timestamp_ns // 1000)).isoformat()
+
+
+def _is_tracking_param(key: str) -> bool:
+    """Whether a lowercased query key only tracks the click, not the page."""
+    return key in _TRACKING_PARAMS or key.startswith(_TRACKING_PARAM_PREFIXES)
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL for duplicate detection.
+    
+    Lowercases scheme and host, drops a leading "www.", a trailing slash,
+    the fragment and click-tracking parameters (utm_*, fbclid, gclid, ...),
+    and sorts the remaining query, so variants of one landing page compare
+    equal. Not meant for fetching; keep the original URL for that.
+    
+    Args:
+        url: URL to normalize
+        
+    Returns:
+        Canonical form of the URL (the input itself if it can't be parsed)
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(key.lower())
+    ))
+    return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip("/") or "/", query, ""))
+
+
 def human_typing_delay() -> float:
     """
     Generate a human-like typing delay.
@@ -40,6 +123,21 @@ def human_typing_delay() -> float:
     return delay
 
 
+@lru_cache(maxsize=32)
+def _bezier_weights(steps: int) -> Tuple[Tuple[float, float, float, float], ...]:
+    """
+    Cubic Bezier (Bernstein) weights at t = 0, 1/steps, ..., 1.
+    
+    They depend only on the step count, which callers rarely vary.
+    """
+    weights = []
+    for i in range(steps + 1):
+        t = i / steps
+        u = 1 - t
+        weights.append((u * u * u, 3 * u * u * t, 3 * u * t * t, t * t * t))
+    return tuple(weights)
+
+
 def generate_realistic_mouse_path(
     start: Tuple[float, float],
     end: Tuple[float, float],
@@ -57,51 +155,36 @@ def generate_realistic_mouse_path(
     Returns:
         List of (x, y) coordinates forming the path
     """
+    sx, sy = start
+    ex, ey = end
+    
     # Generate control points for Bezier curve
     # Add some randomness to make it look more natural
-    mid_x = (start[0] + end[0]) / 2 + random.uniform(-50, 50)
-    mid_y = (start[1] + end[1]) / 2 + random.uniform(-50, 50)
-    
-    control1 = (
-        start[0] + (mid_x - start[0]) * 0.33,
-        start[1] + (mid_y - start[1]) * 0.33
-    )
-    control2 = (
-        start[0] + (mid_x - start[0]) * 0.66,
-        start[1] + (mid_y - start[1]) * 0.66
-    )
-    
-    # Generate points along the Bezier curve
-    path = []
-    for i in range(steps + 1):
-        t = i / steps
-        
-        # Cubic Bezier curve formula
-        x = (
-            (1 - t) ** 3 * start[0] +
-            3 * (1 - t) ** 2 * t * control1[0] +
-            3 * (1 - t) * t ** 2 * control2[0] +
-            t ** 3 * end[0]
-        )
-        y = (
-            (1 - t) ** 3 * start[1] +
-            3 * (1 - t) ** 2 * t * control1[1] +
-            3 * (1 - t) * t ** 2 * control2[1] +
-            t ** 3 * end[1]
+    mid_x = (sx + ex) / 2 + random.uniform(-50, 50)
+    mid_y = (sy + ey) / 2 + random.uniform(-50, 50)
+    
+    c1x = sx + (mid_x - sx) * 0.33
+    c1y = sy + (mid_y - sy) * 0.33
+    c2x = sx + (mid_x - sx) * 0.66
+    c2y = sy + (mid_y - sy) * 0.66
+    
+    # Generate points along the Bezier curve, adding slight randomness
+    # (uniform in [-2, 2]) to each point
+    rand = random.random
+    path = [
+        (
+            b0 * sx + b1 * c1x + b2 * c2x + b3 * ex + rand() * 4 - 2,
+            b0 * sy + b1 * c1y + b2 * c2y + b3 * ey + rand() * 4 - 2,
         )
-        
-        # Add slight randomness to each point
-        x += random.uniform(-2, 2)
-        y += random.uniform(-2, 2)
-        
-        path.append((x, y))
+        for b0, b1, b2, b3 in _bezier_weights(steps)
+    ]
     
     return path
 
 
 def calculate_distance(point1: Tuple[float, float], point2: Tuple[float, float]) -> float:
     """Calculate Euclidean distance between two points."""
-    return math.sqrt((point2[0] - point1[0]) ** 2 + (point2[1] - point1[1]) ** 2)
+    return math.hypot(point2[0] - point1[0], point2[1] - point1[1])
 
 
 def should_make_typo(probability: float = 0.05) -> bool:
@@ -117,6 +200,39 @@ def should_make_typo(probability: float = 0.05) -> bool:
     return random.random() < probability
 
 
+_KEYBOARD_MAP = {
+    'a': ['q', 's', 'z'],
+    'b': ['v', 'g', 'h', 'n'],
+    'c': ['x', 'd', 'f', 'v'],
+    'd': ['s', 'e', 'r', 'f', 'c', 'x'],
+    'e': ['w', 'r', 'd', 's'],
+    'f': ['d', 'r', 't', 'g', 'v', 'c'],
+    'g': ['f', 't', 'y', 'h', 'b', 'v'],
+    'h': ['g', 'y', 'u', 'j', 'n', 'b'],
+    'i': ['u', 'o', 'k', 'j'],
+    'j': ['h', 'u', 'i', 'k', 'm', 'n'],
+    'k': ['j', 'i', 'o', 'l', 'm'],
+    'l': ['k', 'o', 'p'],
+    'm': ['n', 'j', 'k'],
+    'n': ['b', 'h', 'j', 'm'],
+    'o': ['i', 'p', 'l', 'k'],
+    'p': ['o', 'l'],
+    'q': ['w', 'a'],
+    'r': ['e', 't', 'f', 'd'],
+    's': ['a', 'w', 'e', 'd', 'x', 'z'],
+    't': ['r', 'y', 'g', 'f'],
+    'u': ['y', 'i', 'j', 'h'],
+    'v': ['c', 'f', 'g', 'b'],
+    'w': ['q', 'e', 's', 'a'],
+    'x': ['z', 's', 'd', 'c'],
+    'y': ['t', 'u', 'h', 'g'],
+    'z': ['a', 's', 'x']
+}
+
+# Neighbours of 'a'..'z' by alphabet index, for get_adjacent_key
+_ADJACENT_KEYS = tuple(tuple(_KEYBOARD_MAP[chr(0x61 + i)]) for i in range(26))
+
+
 def get_adjacent_key(char: str) -> str:
     """
     Get an adjacent key on a QWERTY keyboard for simulating typos.
@@ -127,38 +243,11 @@ def get_adjacent_key(char: str) -> str:
     Returns:
         Adjacent character or original if no mapping exists
     """
-    keyboard_map = {
-        'a': ['q', 's', 'z'],
-        'b': ['v', 'g', 'h', 'n'],
-        'c': ['x', 'd', 'f', 'v'],
-        'd': ['s', 'e', 'r', 'f', 'c', 'x'],
-        'e': ['w', 'r', 'd', 's'],
-        'f': ['d', 'r', 't', 'g', 'v', 'c'],
-        'g': ['f', 't', 'y', 'h', 'b', 'v'],
-        'h': ['g', 'y', 'u', 'j', 'n', 'b'],
-        'i': ['u', 'o', 'k', 'j'],
-        'j': ['h', 'u', 'i', 'k', 'm', 'n'],
-        'k': ['j', 'i', 'o', 'l', 'm'],
-        'l': ['k', 'o', 'p'],
-        'm': ['n', 'j', 'k'],
-        'n': ['b', 'h', 'j', 'm'],
-        'o': ['i', 'p', 'l', 'k'],
-        'p': ['o', 'l'],
-        'q': ['w', 'a'],
-        'r': ['e', 't', 'f', 'd'],
-        's': ['a', 'w', 'e', 'd', 'x', 'z'],
-        't': ['r', 'y', 'g', 'f'],
-        'u': ['y', 'i', 'j', 'h'],
-        'v': ['c', 'f', 'g', 'b'],
-        'w': ['q', 'e', 's', 'a'],
-        'x': ['z', 's', 'd', 'c'],
-        'y': ['t', 'u', 'h', 'g'],
-        'z': ['a', 's', 'x']
-    }
-    
-    char_lower = char.lower()
-    if char_lower in keyboard_map:
-        adjacent = random.choice(keyboard_map[char_lower])
+    # ord() | 0x20 lowercases ASCII letters; everything else lands outside a-z
+    index = (ord(char) | 0x20) - 0x61 if len(char) == 1 else -1
+    if 0 <= index < 26:
+        neighbours = _ADJACENT_KEYS[index]
+        adjacent = neighbours[int(random.random() * len(neighbours))]
         return adjacent.upper() if char.isupper() else adjacent
     return char
 
@@ -186,7 +275,5 @@ def is_valid_email(email: str) -> bool:
     Returns:
         True if email appears valid
     """
-    import re
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
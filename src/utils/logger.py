@@ -4,20 +4,42 @@ Logging configuration using Loguru.
 
 import sys
 from pathlib import Path
+from typing import Optional, Tuple
 from loguru import logger
 
 from src.config import get_config
 
+# Settings the current handlers were built from; None until the first setup
+_configured_with: Optional[Tuple] = None
+
 
 def setup_logger():
-    """Configure the logger with file and console output."""
-    # Remove default handler
-    logger.remove()
+    """
+    Configure the logger with file and console output.
+    
+    Calling it again with unchanged logging settings keeps the existing
+    handlers instead of tearing them down and rebuilding them.
+    """
+    global _configured_with
     
     # Load config
     config = get_config()
     log_config = config.logging
     
+    settings = (
+        config.app.log_level,
+        log_config.directory,
+        log_config.file_name,
+        log_config.format,
+        log_config.rotation,
+        log_config.retention,
+    )
+    if settings == _configured_with:
+        return logger
+    
+    # Remove default handler
+    logger.remove()
+    
     # Create logs directory
     log_dir = Path(log_config.directory)
     log_dir.mkdir(parents=True, exist_ok=True)
@@ -41,6 +63,7 @@ def setup_logger():
         compression="zip"
     )
     
+    _configured_with = settings
     logger.info("Logger initialized")
     return logger
 
@@ -6,6 +6,7 @@ Implements exponential backoff, circuit breaker, and retry decorators.
 import asyncio
 import functools
 import random
+import threading
 import time
 from typing import Callable, TypeVar, Optional, Type, Tuple, Any
 from loguru import logger
@@ -20,7 +21,8 @@ class CircuitBreaker:
     States:
     - CLOSED: Normal operation, requests pass through
     - OPEN: Failures exceeded threshold, requests fail fast
-    - HALF_OPEN: Testing if service recovered
+    - HALF_OPEN: Testing if service recovered, one probe call at a time;
+      half_open_max_calls consecutive successes close the circuit
     """
     
     CLOSED = "closed"
@@ -39,49 +41,79 @@ class CircuitBreaker:
         
         self.state = self.CLOSED
         self.failure_count = 0
+        # time.monotonic() of the latest failure; immune to wall-clock jumps
         self.last_failure_time: Optional[float] = None
+        # Consecutive successful probes since entering HALF_OPEN
         self.half_open_calls = 0
+        # Whether a HALF_OPEN probe is currently running; only one at a time
+        self.half_open_in_flight = False
+        
+        # Guards state transitions; sync wrappers may run on several threads.
+        # Never held across an await, so async callers can share it
+        self._lock = threading.Lock()
     
     def can_execute(self) -> bool:
         """Check if request can proceed."""
-        if self.state == self.CLOSED:
+        # Fast path for the common case, without taking the lock; a call
+        # racing a trip to OPEN just counts as having started before it
+        if self.state == _CLOSED:
             return True
         
-        if self.state == self.OPEN:
-            if time.time() - self.last_failure_time >= self.recovery_timeout:
-                self.state = self.HALF_OPEN
-                self.half_open_calls = 0
-                logger.info("Circuit breaker: OPEN -> HALF_OPEN")
+        with self._lock:
+            if self.state == self.CLOSED:
                 return True
-            return False
-        
-        # HALF_OPEN
-        if self.half_open_calls < self.half_open_max_calls:
+            
+            if self.state == self.OPEN:
+                if time.monotonic() - self.last_failure_time >= self.recovery_timeout:
+                    self.state = self.HALF_OPEN
+                    self.half_open_calls = 0
+                    self.half_open_in_flight = True
+                    logger.info("Circuit breaker: OPEN -> HALF_OPEN")
+                    return True
+                return False
+            
+            # HALF_OPEN: let one probe through at a time; the rest fail fast
+            if self.half_open_in_flight:
+                return False
+            self.half_open_in_flight = True
             return True
-        return False
     
     def record_success(self):
         """Record a successful call."""
-        if self.state == self.HALF_OPEN:
-            self.half_open_calls += 1
-            if self.half_open_calls >= self.half_open_max_calls:
-                self.state = self.CLOSED
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.half_open_in_flight = False
+                self.half_open_calls += 1
+                if self.half_open_calls >= self.half_open_max_calls:
+                    self.state = self.CLOSED
+                    self.failure_count = 0
+                    logger.info("Circuit breaker: HALF_OPEN -> CLOSED (recovered)")
+            else:
                 self.failure_count = 0
-                logger.info("Circuit breaker: HALF_OPEN -> CLOSED (recovered)")
-        else:
-            self.failure_count = 0
     
     def record_failure(self):
         """Record a failed call."""
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-        
-        if self.state == self.HALF_OPEN:
-            self.state = self.OPEN
-            logger.warning("Circuit breaker: HALF_OPEN -> OPEN (still failing)")
-        elif self.failure_count >= self.failure_threshold:
-            self.state = self.OPEN
-            logger.warning(f"Circuit breaker: CLOSED -> OPEN (threshold reached: {self.failure_count})")
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure_time = time.monotonic()
+            
+            if self.state == self.HALF_OPEN:
+                self.half_open_in_flight = False
+                self.state = self.OPEN
+                logger.warning("Circuit breaker: HALF_OPEN -> OPEN (still failing)")
+            elif self.failure_count >= self.failure_threshold:
+                self.state = self.OPEN
+                logger.warning(f"Circuit breaker: CLOSED -> OPEN (threshold reached: {self.failure_count})")
+    
+    def record_abandoned(self):
+        """Record a call that ended without a verdict (e.g. cancelled), freeing its probe slot."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.half_open_in_flight = False
+
+
+# Module-level alias for the can_execute fast path
+_CLOSED = CircuitBreaker.CLOSED
 
 
 def retry_with_backoff(
@@ -101,31 +133,34 @@ def retry_with_backoff(
         base_delay: Initial delay in seconds
         max_delay: Maximum delay in seconds
         exponential_base: Base for exponential backoff
-        jitter: Add random jitter to prevent thundering herd
+        jitter: Pick each delay uniformly from [0, delay] ("full jitter")
+            to spread retries out and prevent a thundering herd
         exceptions: Tuple of exception types to catch
         on_retry: Callback function called on each retry
     """
+    # Backoff before each retry, computed once per decorator rather than per attempt
+    delays = tuple(
+        min(base_delay * (exponential_base ** attempt), max_delay)
+        for attempt in range(max_retries)
+    )
+    
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs) -> T:
-            last_exception = None
-            
             for attempt in range(max_retries + 1):
                 try:
                     return await func(*args, **kwargs)
                 except exceptions as e:
-                    last_exception = e
-                    
                     if attempt == max_retries:
                         logger.error(f"{func.__name__} failed after {max_retries + 1} attempts: {e}")
                         raise
                     
-                    # Calculate delay with exponential backoff
-                    delay = min(base_delay * (exponential_base ** attempt), max_delay)
+                    # Exponential backoff delay
+                    delay = delays[attempt]
                     
-                    # Add jitter
+                    # Add full jitter
                     if jitter:
-                        delay = delay * (0.5 + random.random())
+                        delay = random.uniform(0, delay)
                     
                     logger.warning(
                         f"{func.__name__} attempt {attempt + 1}/{max_retries + 1} failed: {e}. "
@@ -136,26 +171,20 @@ def retry_with_backoff(
                         on_retry(e, attempt)
                     
                     await asyncio.sleep(delay)
-            
-            raise last_exception
         
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs) -> T:
-            last_exception = None
-            
             for attempt in range(max_retries + 1):
                 try:
                     return func(*args, **kwargs)
                 except exceptions as e:
-                    last_exception = e
-                    
                     if attempt == max_retries:
                         logger.error(f"{func.__name__} failed after {max_retries + 1} attempts: {e}")
                         raise
                     
-                    delay = min(base_delay * (exponential_base ** attempt), max_delay)
+                    delay = delays[attempt]
                     if jitter:
-                        delay = delay * (0.5 + random.random())
+                        delay = random.uniform(0, delay)
                     
                     logger.warning(
                         f"{func.__name__} attempt {attempt + 1}/{max_retries + 1} failed: {e}. "
@@ -166,8 +195,6 @@ def retry_with_backoff(
                         on_retry(e, attempt)
                     
                     time.sleep(delay)
-            
-            raise last_exception
         
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
@@ -193,6 +220,9 @@ def with_circuit_breaker(circuit_breaker: CircuitBreaker):
             except Exception as e:
                 circuit_breaker.record_failure()
                 raise
+            except BaseException:
+                circuit_breaker.record_abandoned()
+                raise
         
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs) -> T:
@@ -206,6 +236,9 @@ def with_circuit_breaker(circuit_breaker: CircuitBreaker):
             except Exception as e:
                 circuit_breaker.record_failure()
                 raise
+            except BaseException:
+                circuit_breaker.record_abandoned()
+                raise
         
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
@@ -228,23 +261,32 @@ class RateLimiter:
         self.rate = rate
         self.burst = burst
         self.tokens = burst
-        self.last_update = time.time()
+        # Event loop time of the last refill, taken from the same clock
+        # asyncio.sleep uses; set on the first acquire since the global
+        # limiters are created before any loop is running
+        self.last_update: Optional[float] = None
         self._lock = asyncio.Lock()
     
     async def acquire(self):
         """Wait until a token is available."""
-        async with self._lock:
-            now = time.time()
-            elapsed = now - self.last_update
-            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
-            self.last_update = now
-            
-            if self.tokens < 1:
+        loop = asyncio.get_running_loop()
+        while True:
+            async with self._lock:
+                now = loop.time()
+                if self.last_update is None:
+                    self.last_update = now
+                elapsed = now - self.last_update
+                self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+                self.last_update = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
                 wait_time = (1 - self.tokens) / self.rate
-                await asyncio.sleep(wait_time)
-                self.tokens = 0
-            else:
-                self.tokens -= 1
+            
+            # Sleep without the lock so other callers can refill and check too
+            await asyncio.sleep(wait_time)
 
 
 # Global rate limiters for external APIs
@@ -4,14 +4,22 @@ Implements user agent rotation, fingerprint randomization, and modern anti-detec
 """
 
 import random
-from typing import Dict, Any, List, Optional
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import accumulate
+from string import Template
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from loguru import logger
 
 
-@dataclass
+@dataclass(frozen=True)
 class BrowserProfile:
-    """Represents a complete browser fingerprint profile."""
+    """
+    Represents a complete browser fingerprint profile.
+    
+    Frozen so a profile can key caches of the scripts generated from it.
+    """
     user_agent: str
     platform: str
     vendor: str
@@ -56,6 +64,12 @@ USER_AGENTS = {
     ],
 }
 
+# USER_AGENTS keyed by (browser, platform), built once for per-call lookups
+_UA_TABLE: Dict[Tuple[str, str], Tuple[str, ...]] = {
+    tuple(key.split("_", 1)): tuple(agents) for key, agents in USER_AGENTS.items()
+}
+_UA_FALLBACK = _UA_TABLE[("chrome", "windows")]
+
 # Screen resolutions with popularity weights
 SCREEN_RESOLUTIONS = [
     ((1920, 1080), 35),  # Most common
@@ -96,17 +110,55 @@ WEBGL_CONFIGS = {
     ],
 }
 
+# Hardware and preference values, drawn uniformly
+_DEVICE_MEMORY_GB = (4, 8, 16, 32)
+_HARDWARE_CONCURRENCY = (4, 8, 12, 16)
+_COLOR_SCHEMES = ("light", "dark", "no-preference")
+
+
+def _cumulative_table(choices: List[tuple]) -> Tuple[tuple, List[float]]:
+    """Split weighted choices into the choices and their running weight totals."""
+    return tuple(choice for choice, _ in choices), list(accumulate(weight for _, weight in choices))
+
+
+def _pick(values: tuple, cum_weights: List[float]) -> Any:
+    """Sample from a precomputed cumulative table by binary search."""
+    return values[bisect_left(cum_weights, random.random() * cum_weights[-1])]
+
 
 def weighted_choice(choices: List[tuple]) -> Any:
     """Select from weighted choices."""
-    total = sum(weight for _, weight in choices)
-    r = random.uniform(0, total)
-    cumulative = 0
-    for choice, weight in choices:
-        cumulative += weight
-        if r <= cumulative:
-            return choice
-    return choices[-1][0]
+    return _pick(*_cumulative_table(choices))
+
+
+# Cumulative tables for the weighted picks made on every profile generation
+_SCREEN_TABLE = _cumulative_table(SCREEN_RESOLUTIONS)
+_TIMEZONE_TABLE = _cumulative_table(TIMEZONES)
+
+# Share of profiles on Windows (the rest are Mac)
+_PLATFORM_THRESH = 0.7
+
+# Per platform: three browsers and the cumulative shares of the first two
+_WINDOWS_BROWSER_THRESH = (0.7, 0.9)
+_MAC_BROWSER_THRESH = (0.6, 0.9)
+_BROWSER_THRESHOLDS = {
+    "windows": (("chrome", "edge", "firefox"), _WINDOWS_BROWSER_THRESH),
+    "mac": (("chrome", "safari", "firefox"), _MAC_BROWSER_THRESH),
+}
+
+
+def _random_platform() -> str:
+    """Pick 'windows' or 'mac' with a single Bernoulli draw."""
+    return "windows" if random.random() < _PLATFORM_THRESH else "mac"
+
+
+def _random_browser(platform: str) -> str:
+    """Pick a browser for the platform by comparing one draw to its thresholds."""
+    browsers, (first, second) = _BROWSER_THRESHOLDS["windows" if platform == "windows" else "mac"]
+    r = random.random()
+    if r < first:
+        return browsers[0]
+    return browsers[1] if r < second else browsers[2]
 
 
 def get_random_user_agent(browser_type: str = "chrome", platform: str = "random") -> str:
@@ -118,33 +170,28 @@ def get_random_user_agent(browser_type: str = "chrome", platform: str = "random"
         platform: 'windows', 'mac', or 'random'
     """
     if platform == "random":
-        platform = random.choices(["windows", "mac"], weights=[70, 30])[0]
+        platform = _random_platform()
     
     if browser_type == "random":
-        if platform == "windows":
-            browser_type = random.choices(["chrome", "edge", "firefox"], weights=[70, 20, 10])[0]
-        else:
-            browser_type = random.choices(["chrome", "safari", "firefox"], weights=[60, 30, 10])[0]
+        browser_type = _random_browser(platform)
     
-    key = f"{browser_type}_{platform}"
-    if key in USER_AGENTS:
-        return random.choice(USER_AGENTS[key])
-    
-    # Fallback to Chrome Windows
-    return random.choice(USER_AGENTS["chrome_windows"])
+    # Unknown combinations fall back to Chrome Windows
+    ua_list = _UA_TABLE.get((browser_type, platform), _UA_FALLBACK)
+    return ua_list[random.randrange(len(ua_list))]
 
 
 def generate_browser_profile(prefer_platform: str = "random") -> BrowserProfile:
     """
     Generate a complete, consistent browser fingerprint profile.
     """
-    platform = prefer_platform if prefer_platform != "random" else random.choices(["windows", "mac"], weights=[70, 30])[0]
+    platform = prefer_platform if prefer_platform != "random" else _random_platform()
     
     user_agent = get_random_user_agent(browser_type="chrome", platform=platform)
-    screen_res = weighted_choice(SCREEN_RESOLUTIONS)
-    timezone = weighted_choice(TIMEZONES)
+    screen_res = _pick(*_SCREEN_TABLE)
+    timezone = _pick(*_TIMEZONE_TABLE)
     
-    webgl_config = random.choice(WEBGL_CONFIGS.get(platform, WEBGL_CONFIGS["windows"]))
+    webgl_configs = WEBGL_CONFIGS.get(platform, WEBGL_CONFIGS["windows"])
+    webgl_config = webgl_configs[random.randrange(len(webgl_configs))]
     
     return BrowserProfile(
         user_agent=user_agent,
@@ -154,112 +201,108 @@ def generate_browser_profile(prefer_platform: str = "random") -> BrowserProfile:
         webgl_vendor=webgl_config[0],
         timezone=timezone,
         language="en-US",
-        screen_resolution=screen_res,
+        screen_resolution=tuple(screen_res),
         color_depth=24,
-        device_memory=random.choice([4, 8, 16, 32]),
-        hardware_concurrency=random.choice([4, 8, 12, 16]),
+        device_memory=_DEVICE_MEMORY_GB[random.randrange(len(_DEVICE_MEMORY_GB))],
+        hardware_concurrency=_HARDWARE_CONCURRENCY[random.randrange(len(_HARDWARE_CONCURRENCY))],
     )
 
 
-def get_stealth_scripts(profile: BrowserProfile) -> str:
-    """
-    Generate comprehensive stealth scripts for the given profile.
-    These scripts patch browser APIs to avoid detection.
-    """
-    return f"""
+# Stealth patches; only the ${...} slots vary with the profile
+_STEALTH_TEMPLATE = Template("""
     // ============================================
     // ADVANCED STEALTH SCRIPTS
     // ============================================
     
     // 1. Remove webdriver property
-    Object.defineProperty(navigator, 'webdriver', {{
+    Object.defineProperty(navigator, 'webdriver', {
         get: () => undefined,
         configurable: true
-    }});
+    });
     delete navigator.__proto__.webdriver;
     
     // 2. Fix navigator properties
-    Object.defineProperties(navigator, {{
-        platform: {{ get: () => '{profile.platform}' }},
-        vendor: {{ get: () => '{profile.vendor}' }},
-        languages: {{ get: () => ['en-US', 'en'] }},
-        deviceMemory: {{ get: () => {profile.device_memory} }},
-        hardwareConcurrency: {{ get: () => {profile.hardware_concurrency} }},
-    }});
+    Object.defineProperties(navigator, {
+        platform: { get: () => '${platform}' },
+        vendor: { get: () => '${vendor}' },
+        languages: { get: () => ['en-US', 'en'] },
+        deviceMemory: { get: () => ${device_memory} },
+        hardwareConcurrency: { get: () => ${hardware_concurrency} },
+    });
     
     // 3. Chrome runtime (required for many checks)
-    if (!window.chrome) {{
-        window.chrome = {{
-            runtime: {{
-                connect: () => {{}},
-                sendMessage: () => {{}},
-                onMessage: {{ addListener: () => {{}} }},
-            }},
-            loadTimes: () => ({{}}),
-            csi: () => ({{}}),
-        }};
-    }}
+    if (!window.chrome) {
+        window.chrome = {
+            runtime: {
+                connect: () => {},
+                sendMessage: () => {},
+                onMessage: { addListener: () => {} },
+            },
+            loadTimes: () => ({}),
+            csi: () => ({}),
+        };
+    }
     
     // 4. Plugins - mimic real Chrome
-    Object.defineProperty(navigator, 'plugins', {{
-        get: () => {{
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => {
             const plugins = [
-                {{ name: 'Chrome PDF Plugin', filename: 'internal-pdf-viewer', description: 'Portable Document Format' }},
-                {{ name: 'Chrome PDF Viewer', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai', description: '' }},
-                {{ name: 'Native Client', filename: 'internal-nacl-plugin', description: '' }},
+                { name: 'Chrome PDF Plugin', filename: 'internal-pdf-viewer', description: 'Portable Document Format' },
+                { name: 'Chrome PDF Viewer', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai', description: '' },
+                { name: 'Native Client', filename: 'internal-nacl-plugin', description: '' },
             ];
             plugins.item = (i) => plugins[i];
             plugins.namedItem = (name) => plugins.find(p => p.name === name);
-            plugins.refresh = () => {{}};
+            plugins.refresh = () => {};
             return plugins;
-        }}
-    }});
+        }
+    });
     
     // 5. Permissions API
     const originalQuery = window.navigator.permissions?.query;
-    if (originalQuery) {{
-        window.navigator.permissions.query = (parameters) => {{
-            if (parameters.name === 'notifications') {{
-                return Promise.resolve({{ state: Notification.permission, onchange: null }});
-            }}
+    if (originalQuery) {
+        window.navigator.permissions.query = (parameters) => {
+            if (parameters.name === 'notifications') {
+                return Promise.resolve({ state: Notification.permission, onchange: null });
+            }
             return originalQuery.call(navigator.permissions, parameters);
-        }};
-    }}
+        };
+    }
     
     // 6. WebGL fingerprint
     const getParameterProto = WebGLRenderingContext.prototype.getParameter;
-    WebGLRenderingContext.prototype.getParameter = function(parameter) {{
-        if (parameter === 37445) return '{profile.webgl_vendor}';
-        if (parameter === 37446) return '{profile.webgl_vendor}';
+    WebGLRenderingContext.prototype.getParameter = function(parameter) {
+        if (parameter === 37445) return '${webgl_vendor}';
+        if (parameter === 37446) return '${webgl_vendor}';
         return getParameterProto.call(this, parameter);
-    }};
+    };
     
     const getParameter2Proto = WebGL2RenderingContext?.prototype?.getParameter;
-    if (getParameter2Proto) {{
-        WebGL2RenderingContext.prototype.getParameter = function(parameter) {{
-            if (parameter === 37445) return '{profile.webgl_vendor}';
-            if (parameter === 37446) return '{profile.webgl_vendor}';
+    if (getParameter2Proto) {
+        WebGL2RenderingContext.prototype.getParameter = function(parameter) {
+            if (parameter === 37445) return '${webgl_vendor}';
+            if (parameter === 37446) return '${webgl_vendor}';
             return getParameter2Proto.call(this, parameter);
-        }};
-    }}
+        };
+    }
     
     // 7. Screen properties
-    Object.defineProperties(screen, {{
-        width: {{ get: () => {profile.screen_resolution[0]} }},
-        height: {{ get: () => {profile.screen_resolution[1]} }},
-        availWidth: {{ get: () => {profile.screen_resolution[0]} }},
-        availHeight: {{ get: () => {profile.screen_resolution[1] - 40} }},
-        colorDepth: {{ get: () => {profile.color_depth} }},
-        pixelDepth: {{ get: () => {profile.color_depth} }},
-    }});
+    Object.defineProperties(screen, {
+        width: { get: () => ${screen_width} },
+        height: { get: () => ${screen_height} },
+        availWidth: { get: () => ${screen_width} },
+        availHeight: { get: () => ${avail_height} },
+        colorDepth: { get: () => ${color_depth} },
+        pixelDepth: { get: () => ${color_depth} },
+    });
     
     // 8. Fix outerWidth/Height for headless detection
-    Object.defineProperties(window, {{
-        outerWidth: {{ get: () => {profile.screen_resolution[0]} }},
-        outerHeight: {{ get: () => {profile.screen_resolution[1]} }},
-        innerWidth: {{ get: () => {profile.screen_resolution[0] - 10} }},
-        innerHeight: {{ get: () => {profile.screen_resolution[1] - 100} }},
-    }});
+    Object.defineProperties(window, {
+        outerWidth: { get: () => ${screen_width} },
+        outerHeight: { get: () => ${screen_height} },
+        innerWidth: { get: () => ${inner_width} },
+        innerHeight: { get: () => ${inner_height} },
+    });
     
     // 9. Remove Playwright/automation markers
     delete window.__playwright;
@@ -267,55 +310,79 @@ def get_stealth_scripts(profile: BrowserProfile) -> str:
     delete window.__PW_inspect;
     
     // 10. Fix toString to return native function strings
-    const fakeToString = (fn, str) => {{
-        const handler = {{
-            apply: function(target, thisArg, args) {{
+    const fakeToString = (fn, str) => {
+        const handler = {
+            apply: function(target, thisArg, args) {
                 if (thisArg === fn) return str;
                 return target.apply(thisArg, args);
-            }}
-        }};
+            }
+        };
         return new Proxy(Function.prototype.toString, handler);
-    }};
+    };
     
     // 11. Connection type (for mobile detection)
-    Object.defineProperty(navigator, 'connection', {{
-        get: () => ({{
+    Object.defineProperty(navigator, 'connection', {
+        get: () => ({
             effectiveType: '4g',
             rtt: 50,
             downlink: 10,
             saveData: false,
-        }})
-    }});
+        })
+    });
     
     // 12. Battery API (optional, some sites check)
-    if (navigator.getBattery) {{
-        navigator.getBattery = () => Promise.resolve({{
+    if (navigator.getBattery) {
+        navigator.getBattery = () => Promise.resolve({
             charging: true,
             chargingTime: 0,
             dischargingTime: Infinity,
             level: 1,
-        }});
-    }}
+        });
+    }
     
     // 13. Media devices (some sites enumerate)
-    if (navigator.mediaDevices?.enumerateDevices) {{
+    if (navigator.mediaDevices?.enumerateDevices) {
         const original = navigator.mediaDevices.enumerateDevices.bind(navigator.mediaDevices);
-        navigator.mediaDevices.enumerateDevices = async () => {{
+        navigator.mediaDevices.enumerateDevices = async () => {
             const devices = await original();
             // Return some fake devices if empty (headless usually has none)
-            if (devices.length === 0) {{
+            if (devices.length === 0) {
                 return [
-                    {{ deviceId: 'default', kind: 'audioinput', label: '', groupId: 'default' }},
-                    {{ deviceId: 'default', kind: 'audiooutput', label: '', groupId: 'default' }},
-                    {{ deviceId: 'default', kind: 'videoinput', label: '', groupId: 'default' }},
+                    { deviceId: 'default', kind: 'audioinput', label: '', groupId: 'default' },
+                    { deviceId: 'default', kind: 'audiooutput', label: '', groupId: 'default' },
+                    { deviceId: 'default', kind: 'videoinput', label: '', groupId: 'default' },
                 ];
-            }}
+            }
             return devices;
-        }};
-    }}
+        };
+    }
     
     console.log('[Stealth] Anti-detection patches applied');
+    """)
+
+
+@lru_cache(maxsize=32)
+def get_stealth_scripts(profile: BrowserProfile) -> str:
     """
+    Generate comprehensive stealth scripts for the given profile.
+    These scripts patch browser APIs to avoid detection.
+    
+    Cached per profile; the session profile is reused for every context.
+    """
+    width, height = profile.screen_resolution
+    return _STEALTH_TEMPLATE.substitute(
+        platform=profile.platform,
+        vendor=profile.vendor,
+        device_memory=profile.device_memory,
+        hardware_concurrency=profile.hardware_concurrency,
+        webgl_vendor=profile.webgl_vendor,
+        screen_width=width,
+        screen_height=height,
+        avail_height=height - 40,
+        inner_width=width - 10,
+        inner_height=height - 100,
+        color_depth=profile.color_depth,
+    )
 
 
 def get_context_options(profile: BrowserProfile, proxy_config: Optional[Dict] = None) -> Dict[str, Any]:
@@ -332,7 +399,7 @@ def get_context_options(profile: BrowserProfile, proxy_config: Optional[Dict] =
         "timezone_id": profile.timezone,
         "permissions": ["geolocation"],
         "geolocation": {"latitude": 40.7128, "longitude": -74.0060},  # NYC default
-        "color_scheme": random.choice(["light", "dark", "no-preference"]),
+        "color_scheme": _COLOR_SCHEMES[random.randrange(len(_COLOR_SCHEMES))],
         "extra_http_headers": {
             "Accept-Language": "en-US,en;q=0.9",
             "Accept-Encoding": "gzip, deflate, br",